@@ -1,247 +1,345 @@
-import pandas as pd
+import sys
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 import seaborn as sns
 from collections import Counter
-import jieba
-from wordcloud import WordCloud
 import numpy as np
-from pathlib import Path
-
-# 设置中文字体和样式
-plt.rcParams['font.sans-serif'] = ['SimHei']
-plt.rcParams['axes.unicode_minus'] = False
-plt.rcParams['figure.facecolor'] = 'white'
-
-# 尝试使用系统字体文件
-font_path = r'C:\Windows\Fonts\simhei.ttf'
-if Path(font_path).exists():
-    from matplotlib.font_manager import FontProperties
-    zhfont = FontProperties(fname=font_path)
-    plt.rcParams['font.sans-serif'] = [zhfont.get_name()]
-else:
-    # 备选方案
-    plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'Microsoft YaHei']
 
+import fonts
+import tracing
+from dedup import deduplicated, tokenize
+from data_loader import METRICS, load_data, load_summary, product_color, short_name, source_name
+from render_pool import RenderJob, SharedRef, run_jobs, select_jobs
+from quantile_sketch import (KLLSketch, box_stats, daily_sketches, load_sketches, merge_days,
+                             save_sketches, update_sketches)
+from timeseries import (HOURS, WEEKDAYS, publish_counts, hour_weekday_matrix,
+                        load_counts, save_counts, update_counts)
+
+# 设置样式和中文字体（seaborn 样式会覆盖字体设置，需先设置样式）
 sns.set_style("whitegrid")
+fonts.setup_matplotlib()
+plt.rcParams['figure.facecolor'] = 'white'
 
-# 蓝绿色系低饱和度配色
-COLOR_PALETTE = {
-    'color1': '#5B9BA6',  # 蓝绿主色
-    'color2': '#8FB3AB',  # 浅蓝绿
-    'color3': '#A3C4BC',  # 更浅蓝绿
-    'color4': '#B5D4CB',  # 淡蓝绿
-}
-
-# 读取数据
-file1 = '固体杨枝甘露-全平台Top20作品导出 1118~1218.xlsx'
-file2 = '奶皮子糖葫芦-全平台Top20作品导出 1118~1218.xlsx'
+# 跨运行的累积记录（每次运行用新数据覆盖其涉及的日期），按数据来源分开保存：
+# 每日发布数量、每天各互动指标的分位数草图
+DAILY_COUNTS_FILE = '发布数量_按天_{source}.csv'
+SKETCH_FILE = '互动分布草图_{source}.json'
 
-df1 = pd.read_excel(file1)
-df2 = pd.read_excel(file2)
 
-# 添加产品名称标签
-df1['产品'] = '固体杨枝甘露'
-df2['产品'] = '奶皮子糖葫芦'
+# ============ 1. 标题分词和词云 ============
+def word_frequencies(texts):
+    """统计一组标题的词频（需要排除近似重复时，先用 dedup.deduplicated 去重再传入）"""
+    counter = Counter()
+    for title in texts.dropna():
+        counter.update(tokenize(title))
+    return counter
 
-# 合并数据
-df_all = pd.concat([df1, df2], ignore_index=True)
 
-print("=" * 50)
-print("数据加载完成")
-print(f"固体杨枝甘露: {len(df1)} 条作品")
-print(f"奶皮子糖葫芦: {len(df2)} 条作品")
-print("=" * 50)
+def create_wordclouds(batch, width=1200, height=600):
+    """批量生成词云，batch 为 (词频, 标题, 文件名) 列表
 
-# ============ 1. 标题分词和词云 ============
-def create_wordcloud(texts, title, filename):
-    """生成词云"""
-    # 合并所有文本
-    text = ' '.join(texts.dropna().astype(str))
+    直接由词频排版（不再拼接文本重新分词），图片按 width×height 原尺寸写出；
+    标题不为空时用 matplotlib 在图片顶部叠加标题，输出尺寸不变。
+    """
+    from wordcloud import WordCloud
     
-    # 分词
-    words = jieba.cut(text)
-    words_list = [w for w in words if len(w) > 1]  # 过滤单字
-    
-    # 生成词云
     wc = WordCloud(
-        font_path='C:\\Windows\\Fonts\\SimHei.ttf',
-        width=1200, 
-        height=600,
+        font_path=fonts.wordcloud_font(),
+        width=width, 
+        height=height,
         background_color='white',
         colormap='viridis'
-    ).generate(' '.join(words_list))
+    )
     
-    plt.figure(figsize=(15, 8))
-    plt.imshow(wc, interpolation='bilinear')
-    plt.axis('off')
-    plt.title(title, fontsize=16, fontweight='bold', pad=20)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"✓ 词云已保存: {filename}")
-    plt.close()
-
-# 创建各产品的词云
-create_wordcloud(df1['标题'], '固体杨枝甘露 - 标题词云', '杨枝甘露_词云.png')
-create_wordcloud(df2['标题'], '奶皮子糖葫芦 - 标题词云', '奶皮子_词云.png')
+    for frequencies, title, filename in batch:
+        if not frequencies:
+            print(f"  ⚠️  无有效词语，跳过词云: {filename}")
+            continue
+        with tracing.span('词云排版', file=filename):
+            wc.generate_from_frequencies(frequencies)
+        
+        if not title:
+            wc.to_file(filename)
+        else:
+            dpi = 100
+            fig = plt.figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+            ax = fig.add_axes([0, 0, 1, 1])
+            ax.imshow(wc.to_array(), interpolation='nearest')
+            ax.axis('off')
+            fig.text(0.5, 0.98, title, ha='center', va='top', fontsize=16, fontweight='bold',
+                     bbox=dict(facecolor='white', edgecolor='none', alpha=0.8))
+            with tracing.span('savefig', file=filename):
+                fig.savefig(filename, dpi=dpi)
+            plt.close(fig)
+        print(f"✓ 词云已保存: {filename}")
+
+
+def create_wordcloud(frequencies, title, filename):
+    """生成词云"""
+    create_wordclouds([(frequencies, title, filename)])
 
-print()
 
 # ============ 2. 高频词统计 ============
 def get_top_keywords(texts, top_n=15):
     """获取高频词"""
-    text = ' '.join(texts.dropna().astype(str))
-    words = jieba.cut(text)
-    words_list = [w for w in words if len(w) > 1]
-    counter = Counter(words_list)
-    return counter.most_common(top_n)
-
-top_words_1 = get_top_keywords(df1['标题'])
-top_words_2 = get_top_keywords(df2['标题'])
-
-fig, axes = plt.subplots(1, 2, figsize=(16, 6))
-
-# 固体杨枝甘露
-words_1, counts_1 = zip(*top_words_1)
-axes[0].barh(words_1[::-1], counts_1[::-1], color=COLOR_PALETTE['color1'])
-axes[0].set_xlabel('出现频次', fontsize=12)
-axes[0].set_title('固体杨枝甘露 - 高频词TOP15', fontsize=14, fontweight='bold')
-axes[0].grid(axis='x', alpha=0.3)
-
-# 奶皮子糖葫芦
-words_2, counts_2 = zip(*top_words_2)
-axes[1].barh(words_2[::-1], counts_2[::-1], color=COLOR_PALETTE['color2'])
-axes[1].set_xlabel('出现频次', fontsize=12)
-axes[1].set_title('奶皮子糖葫芦 - 高频词TOP15', fontsize=14, fontweight='bold')
-axes[1].grid(axis='x', alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('高频词对比.png', dpi=300, bbox_inches='tight')
-print("✓ 高频词对比已保存: 高频词对比.png")
-plt.close()
+    return word_frequencies(texts).most_common(top_n)
 
-# ============ 3. 互动数据对比 ============
-# 清理数据 - 转换为数值类型
-for col in ['获赞数', '评论数', '分享数', '收藏数']:
-    df1[col] = pd.to_numeric(df1[col], errors='coerce')
-    df2[col] = pd.to_numeric(df2[col], errors='coerce')
-
-metrics = ['获赞数', '评论数', '分享数', '收藏数']
-fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-axes = axes.flatten()
-
-for idx, metric in enumerate(metrics):
-    data_to_plot = [
-        df1[metric].dropna(),
-        df2[metric].dropna()
-    ]
+
+def create_keyword_chart(frequencies, products, filename='高频词对比.png', top_n=15):
+    """各产品高频词TOP15对比，frequencies 为 {产品: 词频}"""
+    fig, axes = plt.subplots(1, len(products), figsize=(8 * len(products), 6), squeeze=False)
     
-    bp = axes[idx].boxplot(data_to_plot, labels=['固体杨枝甘露', '奶皮子糖葫芦'],
-                           patch_artist=True)
+    for idx, (product, ax) in enumerate(zip(products, axes[0])):
+        top_words = frequencies[product].most_common(top_n)
+        if not top_words:
+            continue
+        words, counts = zip(*top_words)
+        ax.barh(words[::-1], counts[::-1], color=product_color(idx))
+        ax.set_xlabel('出现频次', fontsize=12)
+        ax.set_title(f'{product} - 高频词TOP15', fontsize=14, fontweight='bold')
+        ax.grid(axis='x', alpha=0.3)
     
-    # 设置颜色
-    colors = [COLOR_PALETTE['color1'], COLOR_PALETTE['color2']]
-    for patch, color in zip(bp['boxes'], colors):
-        patch.set_facecolor(color)
+    plt.tight_layout()
+    with tracing.span('savefig', file=filename):
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+    print(f"✓ 高频词对比已保存: {filename}")
+    plt.close()
+
+
+# ============ 3. 互动数据对比 ============
+def create_boxplot_chart(stats, products, filename='互动数据对比.png'):
+    """各互动指标分布箱线图
+
+    stats 为 {指标: [各产品的箱线图统计量]}（见 box_plot_stats），不需要原始数据。
+    """
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    axes = axes.flatten()
     
-    axes[idx].set_ylabel(metric, fontsize=11)
-    axes[idx].set_title(f'{metric} 分布对比', fontsize=12, fontweight='bold')
-    axes[idx].grid(axis='y', alpha=0.3)
+    for idx, metric in enumerate(METRICS):
+        # 来源中没有该指标的产品不画箱体，只保留位置
+        drawn = [(i, box) for i, box in enumerate(stats[metric]) if box is not None]
+        if drawn:
+            bp = axes[idx].bxp([box for _, box in drawn], positions=[i + 1 for i, _ in drawn],
+                               patch_artist=True)
+            # 设置颜色
+            for (i, _), patch in zip(drawn, bp['boxes']):
+                patch.set_facecolor(product_color(i))
+        else:
+            # 所有产品都没有该指标（如只有小红书数据时的分享数/收藏数）
+            axes[idx].text(0.5, 0.5, '无数据', ha='center', va='center',
+                           transform=axes[idx].transAxes, color='#999999')
+        axes[idx].set_xticks(range(1, len(products) + 1))
+        axes[idx].set_xticklabels(products)
+        axes[idx].set_xlim(0.5, len(products) + 0.5)
+        
+        axes[idx].set_ylabel(metric, fontsize=11)
+        axes[idx].set_title(f'{metric} 分布对比', fontsize=12, fontweight='bold')
+        axes[idx].grid(axis='y', alpha=0.3)
+    
+    plt.tight_layout()
+    with tracing.span('savefig', file=filename):
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+    print(f"✓ 互动数据对比已保存: {filename}")
+    plt.close()
+
+
+def box_plot_stats(df_all, products, sketch_file=None):
+    """用分位数草图计算各产品各指标的箱线图统计量
+
+    为每个 (产品, 发布日期, 指标) 建立草图；sketch_file 不为空时先并入该文件中的累积记录
+    （新数据覆盖其涉及的 (产品, 日期)）并保存，再按产品合并所有日期的草图，
+    以前运行的数据只需保存草图，不必重新读取原始数据。
+    """
+    sketches = daily_sketches(df_all, METRICS)
+    if sketch_file is not None:
+        sketches = update_sketches(load_sketches(sketch_file), sketches)
+        save_sketches(sketches, sketch_file)
+    sketches = merge_days(sketches)
+    empty = KLLSketch()
+    return {
+        metric: [box_stats(sketches.get((product, metric), empty), label=product)
+                 for product in products]
+        for metric in METRICS
+    }
 
-plt.tight_layout()
-plt.savefig('互动数据对比.png', dpi=300, bbox_inches='tight')
-print("✓ 互动数据对比已保存: 互动数据对比.png")
-plt.close()
 
 # ============ 5. 平均互动数据对比 ============
-metrics_stats = []
-
-for metric in metrics:
-    metrics_stats.append({
-        '指标': metric,
-        '固体杨枝甘露': df1[metric].mean(),
-        '奶皮子糖葫芦': df2[metric].mean()
-    })
-
-df_stats = pd.DataFrame(metrics_stats)
-df_stats_plot = df_stats.set_index('指标')
-
-fig, ax = plt.subplots(figsize=(12, 6))
-
-x = np.arange(len(df_stats_plot.index))
-width = 0.35
-
-bars1 = ax.bar(x - width/2, df_stats_plot['固体杨枝甘露'], width, 
-              label='固体杨枝甘露', color=COLOR_PALETTE['color1'])
-bars2 = ax.bar(x + width/2, df_stats_plot['奶皮子糖葫芦'], width,
-              label='奶皮子糖葫芦', color=COLOR_PALETTE['color2'])
-
-ax.set_ylabel('平均数值', fontsize=12)
-ax.set_title('互动指标平均值对比', fontsize=14, fontweight='bold')
-ax.set_xticks(x)
-ax.set_xticklabels(df_stats_plot.index)
-ax.legend(fontsize=11)
-ax.grid(axis='y', alpha=0.3)
-
-# 添加数值标签
-for bars in [bars1, bars2]:
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-               f'{height:.0f}', ha='center', va='bottom', fontsize=10)
-
-plt.tight_layout()
-plt.savefig('平均互动对比.png', dpi=300, bbox_inches='tight')
-print("✓ 平均互动对比已保存: 平均互动对比.png")
-plt.close()
+def create_mean_chart(summary, filename='平均互动对比.png'):
+    """各产品互动指标平均值柱状图"""
+    df_stats_plot = summary['mean'].T  # 行：指标，列：产品
+    products = summary['products']
+    
+    fig, ax = plt.subplots(figsize=(12, 6))
+    
+    x = np.arange(len(df_stats_plot.index))
+    width = 0.7 / len(products)
+    
+    all_bars = []
+    for i, product in enumerate(products):
+        offset = (i - (len(products) - 1) / 2) * width
+        all_bars.append(ax.bar(x + offset, df_stats_plot[product], width,
+                               label=product, color=product_color(i)))
+    
+    ax.set_ylabel('平均数值', fontsize=12)
+    ax.set_title('互动指标平均值对比', fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(df_stats_plot.index)
+    ax.legend(fontsize=11)
+    ax.grid(axis='y', alpha=0.3)
+    
+    # 添加数值标签
+    for bars in all_bars:
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height,
+                   f'{height:.0f}', ha='center', va='bottom', fontsize=10)
+    
+    plt.tight_layout()
+    with tracing.span('savefig', file=filename):
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+    print(f"✓ 平均互动对比已保存: {filename}")
+    plt.close()
+
 
 # ============ 6. 发布时间分析 ============
-df_all['发布时间'] = pd.to_datetime(df_all['发布时间'], errors='coerce')
-df_all['日期'] = df_all['发布时间'].dt.date
-df_all['时段'] = df_all['发布时间'].dt.hour
-
-fig, axes = plt.subplots(1, 2, figsize=(15, 6))
-
-# 按产品统计发布日期分布
-for product, ax, color in [('固体杨枝甘露', axes[0], COLOR_PALETTE['color1']), 
-                            ('奶皮子糖葫芦', axes[1], COLOR_PALETTE['color2'])]:
-    date_dist = df_all[df_all['产品'] == product]['日期'].value_counts().sort_index()
-    ax.plot(range(len(date_dist)), date_dist.values, marker='o', linewidth=2, 
-           markersize=6, color=color)
-    ax.fill_between(range(len(date_dist)), date_dist.values, alpha=0.3, color=color)
-    ax.set_xlabel('发布日期', fontsize=11)
-    ax.set_ylabel('作品数量', fontsize=11)
-    ax.set_title(f'{product} - 发布日期分布', fontsize=12, fontweight='bold')
-    ax.grid(alpha=0.3)
-    # 显示x轴标签
-    if len(date_dist) <= 10:
-        ax.set_xticks(range(len(date_dist)))
-        ax.set_xticklabels([str(d)[-5:] for d in date_dist.index], rotation=45)
-
-plt.tight_layout()
-plt.savefig('发布时间分布.png', dpi=300, bbox_inches='tight')
-print("✓ 发布时间分布已保存: 发布时间分布.png")
-plt.close()
+def create_time_chart(daily, filename='发布时间分布.png'):
+    """各产品发布日期分布
+
+    daily 为 timeseries.publish_counts 的结果：连续日期索引，没有发布的日期记0。
+    """
+    products = list(daily.columns)
+    fig, axes = plt.subplots(1, len(products), figsize=(7.5 * len(products), 6), squeeze=False)
+    
+    for idx, (product, ax) in enumerate(zip(products, axes[0])):
+        color = product_color(idx)
+        counts = daily[product]
+        ax.plot(counts.index, counts.values, marker='o', linewidth=2,
+               markersize=6 if len(counts) <= 60 else 0, color=color)
+        ax.fill_between(counts.index, counts.values, alpha=0.3, color=color)
+        ax.set_xlabel('发布日期', fontsize=11)
+        ax.set_ylabel('作品数量', fontsize=11)
+        ax.set_title(f'{product} - 发布日期分布', fontsize=12, fontweight='bold')
+        ax.set_ylim(bottom=0)
+        ax.grid(alpha=0.3)
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator(maxticks=10))
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
+        plt.setp(ax.get_xticklabels(), rotation=45)
+    
+    plt.tight_layout()
+    with tracing.span('savefig', file=filename):
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+    print(f"✓ 发布时间分布已保存: {filename}")
+    plt.close()
+
+
+# ============ 7. 发布时段热力图 ============
+def create_heatmap_chart(matrix, filename='发布时段热力图.png'):
+    """各产品 星期 × 小时 发布数量热力图
+
+    matrix 为 timeseries.hour_weekday_matrix 的结果。
+    """
+    products = list(matrix.index.get_level_values('产品').unique())
+    fig, axes = plt.subplots(len(products), 1, figsize=(14, 4 * len(products)), squeeze=False)
+    
+    for product, ax in zip(products, axes[:, 0]):
+        values = matrix.loc[product]
+        im = ax.imshow(values.to_numpy(), aspect='auto', cmap='GnBu')
+        ax.set_xticks(range(len(HOURS)))
+        ax.set_xticklabels(HOURS, fontsize=9)
+        ax.set_yticks(range(len(WEEKDAYS)))
+        ax.set_yticklabels(WEEKDAYS, fontsize=10)
+        ax.set_xlabel('发布时段（时）', fontsize=11)
+        ax.set_title(f'{product} - 发布时段分布', fontsize=12, fontweight='bold')
+        ax.grid(False)
+        fig.colorbar(im, ax=ax, label='作品数量')
+    
+    plt.tight_layout()
+    with tracing.span('savefig', file=filename):
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+    print(f"✓ 发布时段热力图已保存: {filename}")
+    plt.close()
+
 
 # ============ 8. 生成统计摘要 ============
-print("\n" + "=" * 50)
-print("数据统计摘要")
-print("=" * 50)
-
-print("\n📊 固体杨枝甘露")
-print(f"  总作品数: {len(df1)}")
-print(f"  平均获赞: {df1['获赞数'].mean():.0f}")
-print(f"  平均评论: {df1['评论数'].mean():.0f}")
-print(f"  平均分享: {df1['分享数'].mean():.0f}")
-print(f"  平均收藏: {df1['收藏数'].mean():.0f}")
-print(f"  活跃账号数: {df1['账号'].nunique()}")
-
-print("\n📊 奶皮子糖葫芦")
-print(f"  总作品数: {len(df2)}")
-print(f"  平均获赞: {df2['获赞数'].mean():.0f}")
-print(f"  平均评论: {df2['评论数'].mean():.0f}")
-print(f"  平均分享: {df2['分享数'].mean():.0f}")
-print(f"  平均收藏: {df2['收藏数'].mean():.0f}")
-print(f"  活跃账号数: {df2['账号'].nunique()}")
-
-print("\n✅ 所有分析图表已生成!")
-print("=" * 50)
+def print_summary(summary):
+    """打印各产品统计摘要"""
+    print("\n" + "=" * 50)
+    print("数据统计摘要")
+    print("=" * 50)
+    
+    for product in summary['products']:
+        mean = summary['mean'].loc[product]
+        print(f"\n📊 {product}")
+        print(f"  总作品数: {summary['count'][product]}")
+        print(f"  平均获赞: {mean['获赞数']:.0f}")
+        print(f"  平均评论: {mean['评论数']:.0f}")
+        print(f"  平均分享: {mean['分享数']:.0f}")
+        print(f"  平均收藏: {mean['收藏数']:.0f}")
+        print(f"  活跃账号数: {summary['accounts'][product]}")
+
+
+def product_jobs(product, frequencies):
+    """只依赖单个产品数据的渲染任务（词云）"""
+    filename = f'{short_name(product)}_词云.png'
+    return [RenderJob(filename, create_wordcloud, (frequencies, f'{product} - 标题词云', filename))]
+
+
+def build_jobs(frequencies, products, product_outputs=True):
+    """本脚本的全部渲染任务（product_outputs 为 False 时不含各产品自己的词云）
+
+    词频和发布时间统计都在主进程中计算一次，各图表共用。
+    """
+    jobs = []
+    for product in products if product_outputs else []:
+        jobs += product_jobs(product, frequencies[product])
+    jobs += [
+        RenderJob('高频词对比.png', create_keyword_chart, (SharedRef('frequencies'), products)),
+        RenderJob('互动数据对比.png', create_boxplot_chart, (SharedRef('boxes'), products)),
+        RenderJob('平均互动对比.png', create_mean_chart, (SharedRef('summary'),)),
+        RenderJob('发布时间分布.png', create_time_chart, (SharedRef('daily'),)),
+        RenderJob('发布时段热力图.png', create_heatmap_chart, (SharedRef('heatmap'),)),
+    ]
+    return jobs
+
+
+def main(max_workers=None, force=False, only=None, exclude_duplicates=False, product_outputs=True):
+    df_all = load_data()
+    summary = load_summary()
+    
+    print("=" * 50)
+    print("数据加载完成")
+    for product in summary['products']:
+        print(f"{product}: {summary['count'][product]} 条作品")
+    print("=" * 50)
+    
+    # 词云和高频词共用同一份词频；去重时每个产品内的近似重复标题每组只计一次（与 TOP作品 相同）
+    titles = deduplicated(df_all) if exclude_duplicates else df_all
+    frequencies = {}
+    for product in summary['products']:
+        with tracing.span('分词与词频', product=product):
+            frequencies[product] = word_frequencies(titles.loc[titles['产品'] == product, '标题'])
+    
+    # 发布时间和箱线图：按天的数量/草图并入该数据来源的累积记录后保存，图表按累积记录绘制
+    source = source_name()
+    with tracing.span('发布时间统计'):
+        counts_file = DAILY_COUNTS_FILE.format(source=source)
+        daily = update_counts(load_counts(counts_file), publish_counts(df_all, 'D'))
+        save_counts(daily, counts_file)
+        daily = daily.reindex(columns=summary['products'], fill_value=0)
+        heatmap = hour_weekday_matrix(df_all)
+    with tracing.span('箱线图统计'):
+        boxes = box_plot_stats(df_all, summary['products'], SKETCH_FILE.format(source=source))
+    
+    run_jobs(select_jobs(build_jobs(frequencies, summary['products'], product_outputs), only),
+             shared={'summary': summary, 'frequencies': frequencies,
+                     'daily': daily, 'heatmap': heatmap, 'boxes': boxes},
+             max_workers=max_workers, force=force)
+    
+    print_summary(summary)
+    
+    print("\n✅ 所有分析图表已生成!")
+    print("=" * 50)
+
+
+if __name__ == '__main__':
+    main(force='--force' in sys.argv)
@@ -0,0 +1,197 @@
+"""
+benchmark.py   —— 分析与出图性能基准
+-------------------------------------------------------------
+功能：
+1. 用 synthetic_data.py 生成 20 / 1万 / 100万 行的合成数据（规模可指定）
+2. 分别计时：加载清洗、分词、词频统计、预聚合、TOP作品/活跃账号、近似重复检测、
+   发布时间统计、箱线图统计，以及 advanced_charts.py 的每个图表函数和 create_table_image
+3. 结果（含 Python/pandas/NumPy 版本、CPU 数等环境信息）保存为 JSON
+4. 指定 --baseline 时与之前的结果逐项对比，变慢超过阈值的阶段标出 ⚠️
+
+每个阶段重复执行取最短耗时；图表输出到临时目录，不影响当前目录的结果文件。
+
+使用示例：
+    python cli.py bench --sizes 20 10000 --output benchmark.json
+    python cli.py bench --baseline benchmark.json
+"""
+
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+import advanced_charts
+import dedup
+import ingest
+from analysis import box_plot_stats, word_frequencies
+from data_loader import aggregate, products
+from ranking import RankingIndex
+from schema import apply_schema
+from synthetic_data import make_exports
+from table_generator import build_summary_table, create_table_image, get_top_works
+from timeseries import hour_weekday_matrix, publish_counts
+
+
+SIZES = (20, 10_000, 1_000_000)
+BENCHMARK_FILE = 'benchmark.json'
+
+# 数据量不超过该值的阶段重复 3 次取最短，更大的只跑 1 次
+REPEAT_LIMIT = 100_000
+
+# 对比基线时：比基线慢 20% 以上、且绝对差超过 10ms 才算变慢
+REGRESSION_RATIO = 1.2
+REGRESSION_MIN_SECONDS = 0.01
+
+CHART_FUNCTIONS = [
+    advanced_charts.create_radar_chart,
+    advanced_charts.create_grouped_bar_chart,
+    advanced_charts.create_stacked_bar_chart,
+]
+
+
+def measure(func, repeat=1, setup=None):
+    """执行 func 若干次，返回最短耗时（秒）；setup 在每次计时前执行，不计入耗时"""
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_size(n_rows, repeat=None, out_dir='.'):
+    """对 n_rows 行的合成数据跑一遍全部阶段，返回 {阶段: 耗时秒}"""
+    repeat = repeat or (3 if n_rows <= REPEAT_LIMIT else 1)
+    exports = make_exports(n_rows)
+    categories = list(exports)
+    results = {}
+
+    def timed(name, func, setup=None):
+        results[name] = measure(func, repeat, setup)
+        print(f"  {results[name]:9.4f}s  {name}")
+
+    def load():
+        raw = ingest.combine(ingest.from_export(df, product) for product, df in exports.items())
+        return apply_schema(raw, categories=categories)
+
+    timed('加载清洗', load)
+    df_all = load()
+    titles = df_all['标题']
+    order = products(df_all)
+
+    dedup.tokenize('杨枝甘露')  # 先加载 jieba 词典，不计入分词耗时
+    timed('分词', lambda: [dedup.tokenize(t) for t in titles], setup=dedup._cut.cache_clear)
+    timed('词频统计', lambda: [word_frequencies(titles[df_all['产品'] == p]) for p in order])
+    timed('预聚合', lambda: aggregate(df_all))
+
+    def rank():
+        index = RankingIndex(df_all)
+        for product in order:
+            index.top_works(product, 8)
+            index.top_accounts(product, 10)
+
+    timed('TOP作品/活跃账号', rank)
+    timed('近似重复检测', lambda: dedup.near_duplicates(titles, groups=df_all['产品']))
+    timed('发布时间统计', lambda: (publish_counts(df_all), hour_weekday_matrix(df_all)))
+    timed('箱线图统计', lambda: box_plot_stats(df_all, order))
+
+    summary = aggregate(df_all)
+    for func in CHART_FUNCTIONS:
+        path = os.path.join(out_dir, f'{func.__name__}.png')
+        timed(func.__name__, lambda: func(summary, filename=path))
+
+    top_works = get_top_works(df_all, order[0])
+    timed('create_table_image（核心数据对比表）',
+          lambda: create_table_image(build_summary_table(summary), '核心数据对比',
+                                     os.path.join(out_dir, 'summary.png')))
+    timed('create_table_image（TOP作品）',
+          lambda: create_table_image(top_works, 'TOP作品榜单', os.path.join(out_dir, 'top.png')))
+    return results
+
+
+def environment():
+    """记录结果时的运行环境，便于判断两次结果是否可比"""
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def run_benchmarks(sizes=SIZES, repeat=None):
+    """按各数据规模依次计时，返回 {'environment': ..., 'results': {行数: {阶段: 耗时}}}"""
+    results = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        for n_rows in sizes:
+            print(f"\n🧮 {n_rows:,} 行")
+            results[str(n_rows)] = run_size(n_rows, repeat, out_dir)
+    return {'environment': environment(), 'results': results}
+
+
+def save_results(report, path=BENCHMARK_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✓ 基准结果已保存: {path}")
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(report, baseline):
+    """与基线逐项对比，打印耗时比值，返回变慢的 [(行数, 阶段, 比值)]"""
+    regressions = []
+    print("\n📊 与基线对比（当前 / 基线）")
+    for size, stages in report['results'].items():
+        base_stages = baseline.get('results', {}).get(size)
+        if not base_stages:
+            print(f"  ⏭  {int(size):,} 行：基线中没有该规模")
+            continue
+        print(f"  {int(size):,} 行")
+        for name, seconds in stages.items():
+            base = base_stages.get(name)
+            if base is None:
+                continue
+            ratio = seconds / base if base > 0 else float('inf')
+            slower = ratio > REGRESSION_RATIO and seconds - base > REGRESSION_MIN_SECONDS
+            mark = '⚠️ ' if slower else '  '
+            print(f"    {mark}{ratio:6.2f}x  {base:9.4f}s → {seconds:9.4f}s  {name}")
+            if slower:
+                regressions.append((size, name, ratio))
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} 个阶段比基线慢 {REGRESSION_RATIO - 1:.0%} 以上")
+    else:
+        print("\n✅ 没有明显变慢的阶段")
+    return regressions
+
+
+def main(sizes=SIZES, repeat=None, output=BENCHMARK_FILE, baseline=None):
+    report = run_benchmarks(sizes, repeat)
+    save_results(report, output)
+    if baseline:
+        return compare(report, load_results(baseline))
+    return []
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    main(sizes)
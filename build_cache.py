@@ -0,0 +1,151 @@
+"""
+build_cache.py   —— 基于内容哈希的增量出图
+-------------------------------------------------------------
+功能：
+1. 为每个输出（如 互动数据雷达图.png、杨枝甘露_TOP作品.png）记录一个指纹：
+   渲染代码 + 输入数据切片 + 图表参数 的哈希。
+   渲染代码包括渲染函数所在模块以及它引用的项目内模块（如 table_render、fonts）的源码，
+   修改辅助函数后相关输出也会重新渲染
+2. 同时记录该任务写出的全部文件（分页的 _2.png、HTML、CSV 等），
+   再次运行时指纹未变且这些文件都存在的输出直接跳过
+3. 重新渲染后，上次写出而这次没有写出的文件（如表格变短后多余的分页）会被删除
+4. 指纹清单保存在 .render_cache.json 中
+
+按产品拆分的任务只接收该产品的数据切片（哈希不含行索引，不受其他产品行数影响），
+因此某个产品新增数据时，只有它自己的图表和汇总类图表会重新渲染。
+数值列按统一类型计入哈希：schema.py 按整张表的取值范围选择位宽，
+其他产品的数据让 获赞数 从 UInt16 变宽为 UInt32 时，本产品的指纹不变。
+"""
+
+import hashlib
+import inspect
+import json
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+CACHE_FILE = '.render_cache.json'
+
+# 项目自身模块所在目录，只有这里的模块源码计入指纹（第三方库不计入）
+_PROJECT_DIR = Path(__file__).resolve().parent
+
+
+def _project_module(obj):
+    """obj 所属的项目内模块（obj 本身是模块时即为它），不属于项目时返回 None"""
+    module = obj if inspect.ismodule(obj) else sys.modules.get(getattr(obj, '__module__', None) or '')
+    path = getattr(module, '__file__', None)
+    if path and Path(path).resolve().parent == _PROJECT_DIR:
+        return module
+    return None
+
+
+@lru_cache(maxsize=None)
+def module_digest(name):
+    """模块及其递归引用的全部项目内模块的源码哈希"""
+    sources = {}
+    stack = [sys.modules[name]]
+    while stack:
+        module = stack.pop()
+        if module.__name__ in sources:
+            continue
+        sources[module.__name__] = Path(module.__file__).read_bytes()
+        for value in vars(module).values():
+            dep = _project_module(value)
+            if dep is not None and dep.__name__ not in sources:
+                stack.append(dep)
+    h = hashlib.sha256()
+    for module_name in sorted(sources):
+        h.update(module_name.encode())
+        h.update(hashlib.sha256(sources[module_name]).digest())
+    return h.hexdigest()
+
+
+def _normalized(series):
+    """去掉存储方式的差异：数值列统一为 Float64，日期统一为纳秒精度（分类列按取值哈希，无需转换）"""
+    dtype = series.dtype
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        return series.astype('Float64')
+    if isinstance(dtype, np.dtype) and dtype.kind == 'M':
+        return series.astype('datetime64[ns]')
+    return series
+
+
+def _update(h, obj):
+    """把对象内容写入哈希"""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(type(obj).__name__.encode())
+        if isinstance(obj, pd.DataFrame):
+            obj = obj.apply(_normalized) if len(obj.columns) else obj
+            h.update(repr(list(obj.columns)).encode())
+            h.update(repr([str(t) for t in obj.dtypes]).encode())
+        else:
+            obj = _normalized(obj)
+            h.update(repr((obj.name, str(obj.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=False).values.tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(repr((obj.dtype.str, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b'{')
+        for key in sorted(obj, key=repr):
+            _update(h, key)
+            _update(h, obj[key])
+        h.update(b'}')
+    elif isinstance(obj, (list, tuple)):
+        h.update(b'[' if isinstance(obj, list) else b'(')
+        for item in obj:
+            _update(h, item)
+        h.update(b']')
+    elif callable(obj):
+        h.update(f'{obj.__module__}.{obj.__qualname__}'.encode())
+        module = _project_module(obj)
+        if module is not None:
+            h.update(module_digest(module.__name__).encode())
+        else:
+            try:
+                h.update(inspect.getsource(obj).encode())
+            except (OSError, TypeError):
+                pass
+    else:
+        h.update(repr(obj).encode())
+
+
+def fingerprint(*objs):
+    """计算任意对象组合（DataFrame、字典、列表、函数等）的内容哈希"""
+    h = hashlib.sha256()
+    for obj in objs:
+        _update(h, obj)
+    return h.hexdigest()
+
+
+class BuildCache:
+    """输出 -> {指纹, 写出的文件} 的清单"""
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = Path(path)
+        try:
+            self.entries = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def is_fresh(self, output, key):
+        """指纹未变且上次写出的文件都存在时返回 True"""
+        entry = self.entries.get(output)
+        return (entry is not None and entry['key'] == key
+                and all(Path(f).exists() for f in entry['files']))
+
+    def record(self, output, key, files=None):
+        """记录渲染结果；上次写出而这次没有写出的文件视为过期并删除"""
+        files = list(files or [output])
+        previous = self.entries.get(output)
+        for stale in set(previous['files'] if previous else []) - set(files):
+            Path(stale).unlink(missing_ok=True)
+        self.entries[output] = {'key': key, 'files': files}
+
+    def save(self):
+        self.path.write_text(json.dumps(self.entries, ensure_ascii=False, indent=2),
+                             encoding='utf-8')
@@ -0,0 +1,255 @@
+"""
+cli.py   —— 统一命令行入口
+-------------------------------------------------------------
+用法：
+    python cli.py crawl [--source xiaohongshu|xinbang|all] [--plan [--budget-posts N] [--budget-minutes M]]
+    python cli.py analyze [--workers N] [--force] [--only 文件名 ...] [--data 来源 ...] [--dedup]
+    python cli.py charts  [--workers N] [--force] [--only 文件名 ...] [--data 来源 ...]
+    python cli.py tables  [--workers N] [--force] [--only 文件名 ...] [--data 来源 ...] [--dedup]
+                          [--formats png html csv]
+    python cli.py all     [--crawl] [--workers N] [--force] [--data 来源 ...] [--dedup]
+    python cli.py pipeline [--workers N] [--dedup] [--queue-size N] [--plan ...]
+    python cli.py daemon  [--sources xiaohongshu xinbang] [--workers N] [--dedup] [--status-file 文件]
+    python cli.py bench   [--sizes 行数 ...] [--repeat N] [--output 文件] [--baseline 文件]
+
+--data 选择分析数据来源：export（全平台导出文件，默认）、xiaohongshu、xinbang，可多选。
+all --crawl 会把爬虫结果在内存中直接交给分析，不经过 Excel 读写。
+--dedup 统计词频和TOP作品时排除近似重复的标题（转载、轻微改写），见 dedup.py。
+--trace 放在子命令之前，记录各阶段耗时并导出 Chrome Trace 文件（--trace-file，默认 trace.json），
+如 python cli.py --trace all。
+--plan 按新榜趋势（keyword_trend.csv）的热度和变化分配小红书各关键词的笔记数和爬取顺序，见 crawl_planner.py。
+pipeline 边爬取小红书边出图：每个关键词爬完即解析、写入Excel并生成它自己的词云和表格，
+全部完成后再生成对比类图表，见 pipeline.py。
+daemon 常驻运行，按 keywords.txt 中每个关键词的间隔定期抓取，只写入新增或变化的数据并重新出图，
+运行状态见 daemon_status.json，见 daemon.py。
+bench 用合成数据对各分析阶段和出图函数计时，结果保存为 JSON，--baseline 与之前的结果对比，见 benchmark.py。
+
+每个子命令只在执行时导入自己需要的模块（pandas/matplotlib/jieba/selenium 等），
+因此 --help 以及只生成单张表格时启动很快。
+"""
+
+import argparse
+import importlib
+
+
+# 子命令 -> 出图脚本模块
+RENDER_MODULES = {
+    'analyze': 'analysis',
+    'charts': 'advanced_charts',
+    'tables': 'table_generator',
+}
+
+# 爬虫来源 -> 爬虫模块
+CRAWL_MODULES = {
+    'xiaohongshu': 'xiaohongshu_spider',
+    'xinbang': 'xinbang_spider',
+}
+
+DATA_SOURCES = ['export', 'xiaohongshu', 'xinbang']
+
+# 支持 --dedup（排除近似重复标题）的出图脚本
+DEDUP_MODULES = {'analysis', 'table_generator'}
+
+
+def crawl_plans(args):
+    """--plan 时按新榜热度生成小红书各关键词的爬取计划"""
+    if not getattr(args, 'plan', False):
+        return None
+    import crawl_planner
+    import xiaohongshu_spider
+
+    plans = crawl_planner.plan_crawl(xiaohongshu_spider.load_keywords(),
+                                     args.budget_posts, args.budget_minutes)
+    crawl_planner.print_plan(plans)
+    return plans
+
+
+def run_crawl(args):
+    """运行爬虫，返回统一列的爬取结果"""
+    import ingest
+
+    sources = list(CRAWL_MODULES) if args.source == 'all' else [args.source]
+    plans = crawl_plans(args) if 'xiaohongshu' in sources else None
+    frames = []
+    for source in sources:
+        module = importlib.import_module(CRAWL_MODULES[source])
+        planned = source == 'xiaohongshu' and plans is not None
+        result = module.main(plans=plans) if planned else module.main()
+        if source == 'xiaohongshu':
+            frames += [ingest.from_xiaohongshu(df, kw) for kw, df in (result or {}).items()]
+        elif result is not None:
+            frames.append(ingest.from_xinbang(result[1]))
+    return ingest.combine(frames)
+
+
+def select_data(args):
+    """非默认数据来源时，切换分析脚本读取的数据"""
+    if args.data != ['export']:
+        import data_loader
+        data_loader.use_sources(args.data)
+
+
+def dedup_options(name, args):
+    """--dedup 只传给支持去重的脚本"""
+    if getattr(args, 'dedup', False) and name in DEDUP_MODULES:
+        return {'exclude_duplicates': True}
+    return {}
+
+
+def run_render(args):
+    select_data(args)
+    name = RENDER_MODULES[args.command]
+    options = {'formats': args.formats} if args.command == 'tables' else {}
+    options.update(dedup_options(name, args))
+    importlib.import_module(name).main(max_workers=args.workers, force=args.force,
+                                       only=args.only, **options)
+
+
+def run_all(args):
+    if args.crawl:
+        import data_loader
+
+        args.source = 'all'
+        crawled = run_crawl(args)
+        if crawled.empty:
+            print("⚠️  爬虫没有返回数据，改用 --data 指定的数据来源")
+            select_data(args)
+        else:
+            data_loader.use_data(crawled, '+'.join(CRAWL_MODULES))
+    else:
+        select_data(args)
+    for name in RENDER_MODULES.values():
+        importlib.import_module(name).main(max_workers=args.workers, force=args.force,
+                                           **dedup_options(name, args))
+
+
+def run_pipeline(args):
+    import pipeline
+
+    pipeline.main(max_workers=args.workers, exclude_duplicates=args.dedup,
+                  queue_size=args.queue_size, plans=crawl_plans(args))
+
+
+def run_daemon(args):
+    import daemon
+
+    daemon.main(sources=args.sources, max_workers=args.workers, exclude_duplicates=args.dedup,
+                status_file=args.status_file)
+
+
+def run_bench(args):
+    import benchmark
+
+    benchmark.main(sizes=args.sizes, repeat=args.repeat, output=args.output, baseline=args.baseline)
+
+
+def add_render_options(parser, only=True):
+    parser.add_argument('--workers', type=int, default=None,
+                        help='渲染进程数（默认CPU核数，1表示在当前进程串行渲染）')
+    parser.add_argument('--force', action='store_true',
+                        help='忽略增量缓存，全部重新生成')
+    parser.add_argument('--data', nargs='+', choices=DATA_SOURCES, default=['export'],
+                        help='分析数据来源（可多选，默认 export）')
+    if only:
+        parser.add_argument('--only', nargs='+', metavar='文件名',
+                            help='只生成指定的输出文件，如 核心数据对比表.png')
+
+
+def add_plan_options(parser):
+    parser.add_argument('--plan', action='store_true',
+                        help='按新榜热度和数据变化分配小红书各关键词的笔记数和爬取顺序')
+    parser.add_argument('--budget-posts', type=int, default=None, metavar='N',
+                        help='--plan 时所有关键词的总笔记数（默认 每个关键词100条 × 关键词数）')
+    parser.add_argument('--budget-minutes', type=float, default=None, metavar='M',
+                        help='--plan 时的总爬取时间（分钟），不够时优先爬分数高的关键词')
+
+
+def add_dedup_option(parser):
+    parser.add_argument('--dedup', action='store_true',
+                        help='词频和TOP作品排除近似重复的标题')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='社交媒体数据爬取与分析')
+    parser.add_argument('--trace', action='store_true',
+                        help='记录各阶段耗时，结束时打印汇总并导出 Chrome Trace 文件')
+    parser.add_argument('--trace-file', default='trace.json', metavar='文件',
+                        help='Chrome Trace 文件路径（默认 trace.json）')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    crawl = sub.add_parser('crawl', help='运行爬虫')
+    crawl.add_argument('--source', choices=[*CRAWL_MODULES, 'all'], default='all',
+                       help='数据来源（默认全部）')
+    add_plan_options(crawl)
+    crawl.set_defaults(func=run_crawl)
+
+    for command, help_text in [('analyze', '基础分析图表（词云、高频词、互动对比等）'),
+                               ('charts', '高级图表（雷达图、分组柱状图、堆积图）'),
+                               ('tables', '表格图片')]:
+        p = sub.add_parser(command, help=help_text)
+        add_render_options(p)
+        if RENDER_MODULES[command] in DEDUP_MODULES:
+            add_dedup_option(p)
+        if command == 'tables':
+            p.add_argument('--formats', nargs='+', choices=['png', 'html', 'csv'], default=['png'],
+                           help='输出格式（可多选，默认 png）')
+        p.set_defaults(func=run_render)
+
+    all_parser = sub.add_parser('all', help='依次生成全部分析图表和表格')
+    all_parser.add_argument('--crawl', action='store_true', help='先运行全部爬虫')
+    add_render_options(all_parser, only=False)
+    add_dedup_option(all_parser)
+    all_parser.set_defaults(func=run_all)
+
+    pipe = sub.add_parser('pipeline', help='边爬取小红书边解析、存储和出图')
+    pipe.add_argument('--workers', type=int, default=None,
+                      help='最后生成对比类图表的进程数（默认CPU核数）')
+    pipe.add_argument('--queue-size', type=int, default=2, metavar='N',
+                      help='各阶段之间最多缓存的关键词数（默认 2）')
+    add_dedup_option(pipe)
+    add_plan_options(pipe)
+    pipe.set_defaults(func=run_pipeline)
+
+    monitor = sub.add_parser('daemon', help='常驻运行，按间隔定期抓取关键词并更新图表')
+    monitor.add_argument('--sources', nargs='+', choices=list(CRAWL_MODULES), default=list(CRAWL_MODULES),
+                         help='抓取来源（默认全部）：xiaohongshu 笔记、xinbang 趋势')
+    monitor.add_argument('--workers', type=int, default=None,
+                         help='出图进程数（默认CPU核数）')
+    monitor.add_argument('--status-file', default='daemon_status.json', metavar='文件',
+                         help='运行状态文件（默认 daemon_status.json）')
+    add_dedup_option(monitor)
+    monitor.set_defaults(func=run_daemon)
+
+    bench = sub.add_parser('bench', help='用合成数据测试分析和出图各阶段的耗时')
+    bench.add_argument('--sizes', nargs='+', type=int, default=[20, 10_000, 1_000_000], metavar='行数',
+                       help='合成数据行数（可多个，默认 20 10000 1000000）')
+    bench.add_argument('--repeat', type=int, default=None,
+                       help='每个阶段重复次数，取最短耗时（默认 10万行以内 3 次，以上 1 次）')
+    bench.add_argument('--output', default='benchmark.json', metavar='文件',
+                       help='结果保存路径（默认 benchmark.json）')
+    bench.add_argument('--baseline', metavar='文件',
+                       help='与之前保存的结果对比，标出变慢的阶段')
+    bench.set_defaults(func=run_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.trace:
+        args.func(args)
+        return
+
+    import tracing
+
+    tracing.enable()
+    try:
+        with tracing.span(args.command, category='command'):
+            args.func(args)
+    finally:
+        tracing.write_trace(args.trace_file)
+        tracing.report()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+crawl_planner.py   —— 按热度分配各关键词的爬取预算
+-------------------------------------------------------------
+功能：
+1. 读取新榜趋势 keyword_trend.csv（keyword, date, volume, hot_index），取每个关键词最近 7 天的平均热度
+2. 变化程度：最近 7 天声量相对之前 7 天的涨跌幅，以及 daemon 上次抓取时笔记的新增/变化比例（取较大者）
+3. 分数 = 热度占比 ×（1 + 变化程度），按分数把总笔记数分给各关键词（每个关键词有最低和最高配额），
+   滚动次数随笔记数增减
+4. 爬取顺序按分数从高到低；总笔记数或总时间不够每个关键词的最低配额时，优先保证分数高的关键词
+
+没有趋势数据的关键词按其他关键词热度的中位数计分，新加入的关键词也能分到预算；
+完全没有趋势数据时各关键词平分预算。
+
+使用示例：
+    plans = plan_crawl(load_keywords(), total_posts=300, total_minutes=20)
+    print_plan(plans)
+    xiaohongshu_spider.main(plans=plans)
+"""
+
+import json
+import math
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ingest import parse_count, parse_publish_time
+from xiaohongshu_spider import MAX_POSTS, SCROLL_TIMES
+from xinbang_spider import TREND_FILE
+
+
+# daemon.py 写入的状态文件（含每个关键词上次抓取的新增/变化行数）
+STATUS_FILE = 'daemon_status.json'
+
+RECENT_DAYS = 7
+MIN_POSTS = 20               # 每个关键词至少抓取的笔记数
+MAX_POSTS_PER_KEYWORD = 400  # 每个关键词最多抓取的笔记数（搜索结果页能加载的数量有限）
+MIN_SCROLLS = 3
+POSTS_PER_SCROLL = MAX_POSTS / SCROLL_TIMES
+
+# 估算耗时（秒）：打开搜索页和关键词间隔、每次滚动、每条笔记的提取
+KEYWORD_SECONDS = 10
+SCROLL_SECONDS = 2.5
+NOTE_SECONDS = 0.2
+
+# 一个关键词的爬取计划
+CrawlPlan = namedtuple('CrawlPlan', ['keyword', 'score', 'max_posts', 'scroll_times'])
+
+
+def read_trend(path=TREND_FILE):
+    """读取趋势数据，日期/声量/热度转换为日期和数字；文件不存在时返回空表"""
+    if not Path(path).exists():
+        return pd.DataFrame({'keyword': pd.Series(dtype=object), 'date': pd.Series(dtype='datetime64[ns]'),
+                             'volume': pd.Series(dtype='float64'), 'hot_index': pd.Series(dtype='float64')})
+    trend = pd.read_csv(path, dtype=str, encoding='utf-8-sig')
+    trend['date'] = pd.to_datetime(trend['date'].map(parse_publish_time), errors='coerce')
+    for col in ('volume', 'hot_index'):
+        # 热度指数可能带小数，先按普通数字解析，'1.2万' 之类再用 parse_count
+        text = trend[col].str.replace(',', '')
+        trend[col] = pd.to_numeric(text, errors='coerce').fillna(
+            pd.to_numeric(text.map(parse_count), errors='coerce'))
+    return trend.dropna(subset=['keyword', 'date'])
+
+
+def read_note_changes(path=STATUS_FILE):
+    """daemon 状态文件中各关键词上次抓取笔记的 (新增+变化) / MAX_POSTS，没有时返回空字典"""
+    try:
+        status = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    changes = {}
+    for keyword, sources in status.get('keywords', {}).items():
+        notes = sources.get('xiaohongshu')
+        if notes and notes.get('runs'):
+            changes[keyword] = min(1.0, (notes['added'] + notes['changed']) / MAX_POSTS)
+    return changes
+
+
+def keyword_scores(keywords, trend, note_changes=None, recent_days=RECENT_DAYS):
+    """各关键词的热度、变化程度和分数（DataFrame，以关键词为索引，按分数降序）"""
+    trend = trend[trend['keyword'].isin(keywords)]
+    # 每个关键词以自己最新的日期为准划分“最近”和“之前”两个窗口
+    age = (trend.groupby('keyword')['date'].transform('max') - trend['date']).dt.days
+    recent = trend[age < recent_days].groupby('keyword')
+    previous = trend[(age >= recent_days) & (age < 2 * recent_days)].groupby('keyword')
+
+    scores = pd.DataFrame(index=pd.Index(keywords, name='keyword'))
+    scores['heat'] = recent['hot_index'].mean()
+    growth = recent['volume'].mean() / previous['volume'].mean().replace(0, np.nan) - 1
+    scores['change'] = growth.abs().clip(upper=1.0)
+    if note_changes:
+        scores['change'] = np.fmax(scores['change'], pd.Series(note_changes).reindex(scores.index))
+
+    # 没有趋势数据的关键词按中位数热度；全部没有时平分
+    known = scores['heat'].dropna()
+    scores['heat'] = scores['heat'].fillna(known.median() if len(known) else 1.0)
+    total = scores['heat'].sum()
+    share = scores['heat'] / total if total > 0 else 1.0 / len(scores)
+    scores['change'] = scores['change'].fillna(0.0)
+    scores['score'] = share * (1 + scores['change'])
+    return scores.sort_values('score', ascending=False, kind='stable')
+
+
+def split_budget(total, weights, low, high):
+    """按权重把 total 分成整数份，每份在 [low, high] 之间（超出上限的部分分给其余各份）
+
+    total 超过 high × n 时按 high × n 分配；不足 low × n 时不会增加总量，而是降低每份的下限。
+    """
+    weights = np.asarray(weights, dtype='float64')
+    n = len(weights)
+    total = int(min(total, high * n))
+    low = min(low, total // n)
+    amounts = np.full(n, float(low))
+    free = np.ones(n, dtype=bool)
+    remaining = total - low * n
+    while remaining > 1e-9 and free.any():
+        w = np.where(free, weights, 0.0)
+        w = w / w.sum() if w.sum() > 0 else free / free.sum()
+        amounts += remaining * w
+        over = amounts > high
+        remaining = (amounts[over] - high).sum()
+        amounts[over] = high
+        free &= ~over
+    # 取整：先向下取整，余数按小数部分从大到小补齐
+    result = np.floor(amounts).astype(int)
+    shortfall = total - result.sum()
+    for i in np.argsort(-(amounts - result), kind='stable')[:shortfall]:
+        result[i] += 1
+    return result
+
+
+def estimate_seconds(max_posts, scroll_times):
+    """估算一个关键词的爬取耗时"""
+    return KEYWORD_SECONDS + scroll_times * SCROLL_SECONDS + max_posts * NOTE_SECONDS
+
+
+def scrolls_for(posts):
+    return max(MIN_SCROLLS, math.ceil(posts / POSTS_PER_SCROLL))
+
+
+def plan_crawl(keywords, total_posts=None, total_minutes=None,
+               trend_file=TREND_FILE, status_file=STATUS_FILE):
+    """生成各关键词的爬取计划，按分数从高到低排列（即爬取顺序）
+
+    total_posts 默认为 MAX_POSTS × 关键词数（与不分配预算时的总量相同）。
+    total_posts 或 total_minutes 连每个关键词的最低配额都放不下时，只保留分数最高的若干关键词；
+    连一个关键词的最低配额都放不下时，只爬分数最高的关键词并减少其笔记数，
+    一条笔记都放不下时返回空计划（不爬取）。
+    指定 total_minutes 时按估算耗时（含滚动次数的取整）收紧总量，估算总耗时不超过该时间。
+    """
+    keywords = list(dict.fromkeys(keywords))
+    if not keywords:
+        return []
+    scores = keyword_scores(keywords, read_trend(trend_file), read_note_changes(status_file))
+    total_posts = MAX_POSTS * len(keywords) if total_posts is None else total_posts
+
+    if total_posts < 1:
+        print(f"⚠️  笔记预算为 {total_posts} 条，不爬取任何关键词")
+        return []
+    fit = max(1, min(len(scores), total_posts // MIN_POSTS))
+    if fit < len(scores):
+        print(f"⚠️  笔记预算 {total_posts} 条只够 {fit} 个关键词（每个至少 {MIN_POSTS} 条），"
+              f"跳过: {', '.join(scores.index[fit:])}")
+        scores = scores.iloc[:fit]
+
+    seconds = None if total_minutes is None else total_minutes * 60
+    if seconds is not None:
+        minimum = estimate_seconds(MIN_POSTS, scrolls_for(MIN_POSTS))
+        fit = min(len(scores), int(seconds // minimum))
+        if not fit:
+            # 不够一个关键词的最低配额：剩余时间全部用于分数最高的关键词（最少滚动次数）
+            posts = int((seconds - estimate_seconds(0, MIN_SCROLLS)) // NOTE_SECONDS)
+            if posts < 1:
+                print(f"⚠️  时间预算 {total_minutes} 分钟不够爬取一个关键词"
+                      f"（至少约 {estimate_seconds(1, MIN_SCROLLS) / 60:.1f} 分钟），不爬取任何关键词")
+                return []
+            fit, total_posts = 1, min(total_posts, posts)
+        if fit < len(scores):
+            print(f"⚠️  时间预算只够 {fit} 个关键词，跳过: {', '.join(scores.index[fit:])}")
+            scores = scores.iloc[:fit]
+        # 超出最低配额的时间换算成额外笔记数（每条笔记分摊滚动和提取耗时）
+        per_post = SCROLL_SECONDS / POSTS_PER_SCROLL + NOTE_SECONDS
+        extra = max(0.0, seconds - minimum * len(scores)) / per_post
+        total_posts = min(total_posts, MIN_POSTS * len(scores) + int(extra))
+
+    posts = split_budget(total_posts, scores['score'], MIN_POSTS, MAX_POSTS_PER_KEYWORD)
+    if seconds is not None:
+        # 滚动次数向上取整、且不少于 MIN_SCROLLS，按笔记数换算会低估耗时；超出时逐步减少总量
+        while total_posts > MIN_POSTS * len(scores):
+            over = sum(estimate_seconds(n, scrolls_for(n)) for n in posts) - seconds
+            if over <= 0:
+                break
+            total_posts = max(MIN_POSTS * len(scores), total_posts - math.ceil(over / per_post))
+            posts = split_budget(total_posts, scores['score'], MIN_POSTS, MAX_POSTS_PER_KEYWORD)
+    return [CrawlPlan(keyword, float(score), int(n), scrolls_for(n))
+            for keyword, score, n in zip(scores.index, scores['score'], posts)]
+
+
+def print_plan(plans):
+    """打印爬取计划和估算耗时"""
+    print("\n🧮 爬取计划（按热度与变化分配）")
+    print(f"  {'关键词':<16}{'分数':>8}{'笔记数':>8}{'滚动':>6}{'估算':>8}")
+    total = 0.0
+    for plan in plans:
+        seconds = estimate_seconds(plan.max_posts, plan.scroll_times)
+        total += seconds
+        print(f"  {plan.keyword:<16}{plan.score:>8.3f}{plan.max_posts:>8}{plan.scroll_times:>6}"
+              f"{seconds / 60:>7.1f}m")
+    print(f"  合计 {sum(p.max_posts for p in plans)} 条，估算 {total / 60:.1f} 分钟")
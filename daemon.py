@@ -0,0 +1,347 @@
+"""
+daemon.py   —— 关键词长期监测（常驻调度）
+-------------------------------------------------------------
+功能：
+1. 每轮重新读取 keywords.txt，增删关键词或修改间隔后无需重启；
+   每行关键词后可写监测间隔，如 “奶皮子糖葫芦 6h”（支持 m/h/d），不写时按来源的默认间隔
+2. 每个关键词按自己的间隔定期抓取：新榜趋势（keyword_trend.csv）、小红书笔记（xiaohongshu_data.xlsx）
+3. 与已保存的数据比较，只有新增或变化的行才写入（笔记按笔记ID，趋势按 关键词+日期；
+   相对发布时间和爬取时间的变化不算作笔记变化）
+4. 小红书数据有变化时重新出图，输入未变化的输出由增量缓存跳过（见 build_cache.py）
+5. 运行状态写入 daemon_status.json：待执行任务数，以及每个关键词各来源的
+   上次运行时间、耗时、新增/变化行数、下次运行时间、延迟和错误信息
+6. 数据只保存在文件中，出图后释放排行/去重缓存，连续运行数周内存也不会持续增长
+
+浏览器启动时各登录一次（需要在终端确认），之后一直复用（小红书浏览器会定期回收，见 ManagedDriver；
+新榜浏览器崩溃后重新启动，用保存的 Cookie 恢复登录）；
+单个任务失败时稍后重试，不影响其他关键词。
+按 Ctrl+C 停止。
+
+使用示例：
+    python cli.py daemon --sources xiaohongshu xinbang
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from selenium.common.exceptions import WebDriverException
+
+import data_loader
+import dedup
+import pipeline
+import ranking
+import xiaohongshu_spider
+import xinbang_spider
+
+
+SOURCES = ['xiaohongshu', 'xinbang']
+# 关键词没有写间隔时的默认监测间隔（秒）
+DEFAULT_INTERVALS = {'xiaohongshu': 6 * 3600, 'xinbang': 24 * 3600}
+# 任务失败后的重试间隔（不超过该关键词本身的间隔）
+RETRY_SECONDS = 15 * 60
+# 没有到期任务时最长休眠时间，醒来后重新读取 keywords.txt 并刷新状态文件
+POLL_SECONDS = 60
+
+STATUS_FILE = 'daemon_status.json'
+
+# 比较笔记是否变化时忽略的列：相对发布时间（'3天前' → '4天前'）和爬取时间每次都会不同
+NOTE_VOLATILE_COLUMNS = ('发布日期', '爬取时间')
+
+
+def _timestamp(seconds):
+    return datetime.fromtimestamp(seconds).isoformat(timespec='seconds') if seconds else None
+
+
+def note_key(df):
+    """笔记的唯一键：笔记ID；没有真实ID（note_序号）时用 标题+用户"""
+    ids = df['笔记ID'].astype(str)
+    fallback = df['标题'].astype(str) + '|' + df['用户'].astype(str)
+    return ids.where(~ids.str.startswith('note_'), fallback)
+
+
+def trend_key(df):
+    """趋势数据的唯一键：关键词 + 日期"""
+    return df['keyword'].astype(str) + '|' + df['date'].astype(str)
+
+
+def merge_rows(old, new, key, ignore=()):
+    """把新抓取的行并入已有数据，键相同的行以新值为准
+
+    返回 (合并后的数据, 新增行数, 变化行数)。比较时统一转成字符串，
+    避免从 Excel/CSV 读回后类型不同被误判为变化；ignore 中的列不参与比较。
+    """
+    new_keys = key(new)
+    new = new[~new_keys.duplicated(keep='last').to_numpy()].reset_index(drop=True)
+    new_keys = key(new)
+    if old is None or old.empty:
+        return new, len(new), 0
+
+    old_keys = key(old)
+    old_unique = old[~old_keys.duplicated(keep='last').to_numpy()]
+    columns = [c for c in new.columns if c not in ignore]
+    previous = old_unique.set_index(key(old_unique).to_numpy()).reindex(columns=columns)
+
+    matched = new_keys.isin(previous.index).to_numpy()
+    before = previous.loc[new_keys[matched].to_numpy()].astype(str).to_numpy()
+    after = new.loc[matched, columns].astype(str).to_numpy()
+    changed = int((before != after).any(axis=1).sum())
+
+    merged = pd.concat([old[~old_keys.isin(new_keys).to_numpy()], new], ignore_index=True)
+    return merged, int((~matched).sum()), changed
+
+
+def read_sheet(path, keyword):
+    """读取 Excel 中某个关键词的 Sheet，不存在时返回 None"""
+    if not Path(path).exists():
+        return None
+    try:
+        return pd.read_excel(path, sheet_name=keyword[:31])
+    except ValueError:  # 没有该 Sheet
+        return None
+
+
+class Task:
+    """一个关键词在一个来源上的定期抓取"""
+
+    def __init__(self, source, keyword, interval):
+        self.source = source
+        self.keyword = keyword
+        self.interval = interval
+        self.next_run = time.time()  # 新加入的关键词立即执行
+        self.last_run = None
+        self.duration = None
+        self.added = self.changed = 0
+        self.runs = 0
+        self.error = None
+
+    def status(self, now):
+        return {
+            'interval': self.interval,
+            'last_run': _timestamp(self.last_run),
+            'duration': None if self.duration is None else round(self.duration, 1),
+            'added': self.added,
+            'changed': self.changed,
+            'runs': self.runs,
+            'error': self.error,
+            'next_run': _timestamp(self.next_run),
+            'lag': round(max(0.0, now - self.next_run), 1),
+        }
+
+
+class Monitor:
+    """按间隔调度各关键词的抓取，写入变化的数据并重新出图"""
+
+    def __init__(self, sources=SOURCES, keywords_file=xiaohongshu_spider.KEYWORDS_FILE,
+                 status_file=STATUS_FILE, max_workers=None, exclude_duplicates=False):
+        self.sources = list(sources)
+        self.keywords_file = keywords_file
+        self.status_file = status_file
+        self.max_workers = max_workers
+        self.exclude_duplicates = exclude_duplicates
+        self.tasks = {}
+        self.drivers = {}
+        self.newrank_cookies = []
+        self.started = time.time()
+        self.state = 'starting'
+
+    # ---------- 关键词与调度 ----------
+    def sync_keywords(self):
+        """重新读取关键词文件：新增关键词立即调度，删除的关键词停止监测，间隔修改即时生效"""
+        try:
+            schedule = xiaohongshu_spider.load_keyword_schedule(self.keywords_file)
+        except OSError as e:
+            print(f"⚠️  无法读取关键词文件，沿用上次的关键词: {e}")
+            return
+        wanted = set()
+        for keyword, interval in schedule.items():
+            for source in self.sources:
+                wanted.add((source, keyword))
+                interval_s = interval or DEFAULT_INTERVALS[source]
+                task = self.tasks.get((source, keyword))
+                if task is None:
+                    self.tasks[(source, keyword)] = Task(source, keyword, interval_s)
+                elif task.interval != interval_s:
+                    if task.last_run is not None:
+                        task.next_run = task.last_run + interval_s
+                    task.interval = interval_s
+        for key in set(self.tasks) - wanted:
+            print(f"⏭  停止监测: {key[1]}（{key[0]}）")
+            del self.tasks[key]
+
+    def due_tasks(self, now):
+        return sorted((t for t in self.tasks.values() if t.next_run <= now),
+                      key=lambda t: t.next_run)
+
+    # ---------- 抓取与存储 ----------
+    def driver(self, source):
+        """各来源的浏览器只手动登录一次
+
+        小红书浏览器由 ManagedDriver 定期回收，重启后自动恢复登录；
+        新榜浏览器崩溃或会话失效后被丢弃（见 drop_driver），下次使用时重建并用保存的 Cookie 恢复登录。
+        """
+        if source not in self.drivers:
+            if source == 'xiaohongshu':
+                driver = xiaohongshu_spider.ManagedDriver()
+                driver.start()
+            else:
+                driver = self.start_newrank()
+            self.drivers[source] = driver
+        return self.drivers[source]
+
+    def start_newrank(self):
+        """启动新榜浏览器：首次手动登录，之后用 Cookie 恢复登录状态"""
+        driver = xinbang_spider.init_driver()
+        if self.newrank_cookies:
+            driver.get("https://www.newrank.cn/")
+            for cookie in self.newrank_cookies:
+                try:
+                    driver.add_cookie(cookie)
+                except WebDriverException:
+                    continue
+            driver.refresh()
+        elif xinbang_spider.login_newrank(driver):
+            self.newrank_cookies = driver.get_cookies()
+        else:
+            driver.quit()
+            raise RuntimeError('新榜登录失败')
+        return driver
+
+    def drop_driver(self, source):
+        """关闭并丢弃某个来源的浏览器（已崩溃的浏览器可能无法正常退出），下次使用时重建"""
+        driver = self.drivers.pop(source, None)
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def crawl_notes(self, keyword):
+        df = self.driver('xiaohongshu').crawl(keyword)
+        if df.empty:
+            return 0, 0
+        path = xiaohongshu_spider.OUTPUT_FILE
+        merged, added, changed = merge_rows(read_sheet(path, keyword), df, note_key,
+                                            ignore=NOTE_VOLATILE_COLUMNS)
+        if added or changed:
+            xiaohongshu_spider.save_sheet(path, keyword, merged)
+        return added, changed
+
+    def crawl_trend(self, keyword):
+        driver = self.driver('xinbang')
+        try:
+            records = xinbang_spider.fetch_keyword_trend(driver, keyword)
+            self.newrank_cookies = driver.get_cookies()
+        except WebDriverException as e:
+            if xiaohongshu_spider.driver_crashed(e):
+                print("  🔁 新榜浏览器已崩溃或会话失效，重试时重新启动")
+                self.drop_driver('xinbang')
+            raise
+        if not records:
+            return 0, 0
+        path = xinbang_spider.TREND_FILE
+        old = pd.read_csv(path, dtype=str, encoding='utf-8-sig') if Path(path).exists() else None
+        merged, added, changed = merge_rows(old, pd.DataFrame(records).astype(str), trend_key)
+        if added or changed:
+            merged.to_csv(path, index=False, encoding='utf-8-sig')
+        return added, changed
+
+    def run_task(self, task):
+        """执行一个任务并安排下次运行，返回数据是否有变化"""
+        start = time.time()
+        lag = start - task.next_run
+        print(f"\n🔄 {task.keyword}（{task.source}），延迟 {lag:.0f}s")
+        try:
+            crawl = self.crawl_notes if task.source == 'xiaohongshu' else self.crawl_trend
+            task.added, task.changed = crawl(task.keyword)
+            task.error = None
+            task.next_run = start + task.interval
+            print(f"  ✓ 新增 {task.added} 行，变化 {task.changed} 行")
+        except Exception as e:
+            task.added = task.changed = 0
+            task.error = str(e)
+            task.next_run = start + min(RETRY_SECONDS, task.interval)
+            print(f"  ⚠️  {task.keyword}（{task.source}）抓取失败，稍后重试: {e}")
+        task.last_run = start
+        task.duration = time.time() - start
+        task.runs += 1
+        return bool(task.added or task.changed)
+
+    # ---------- 出图与状态 ----------
+    def render(self):
+        """小红书数据变化后重新出图（未变化的输出由增量缓存跳过），之后释放缓存"""
+        try:
+            data_loader.use_sources(['xiaohongshu'])
+            pipeline.render_final(self.max_workers, self.exclude_duplicates)
+        except Exception as e:
+            print(f"⚠️  出图失败: {e}")
+        finally:
+            ranking.clear_cache()
+            dedup.clear_cache()
+
+    def write_status(self):
+        """写入状态文件（先写临时文件再替换，读取方不会读到一半的内容）"""
+        now = time.time()
+        keywords = {}
+        for task in sorted(self.tasks.values(), key=lambda t: (t.keyword, t.source)):
+            keywords.setdefault(task.keyword, {})[task.source] = task.status(now)
+        upcoming = min((t.next_run for t in self.tasks.values()), default=None)
+        status = {
+            'pid': os.getpid(),
+            'state': self.state,
+            'started': _timestamp(self.started),
+            'updated': _timestamp(now),
+            'queue_depth': len(self.due_tasks(now)),
+            'next_run': _timestamp(upcoming),
+            'keywords': keywords,
+        }
+        tmp = f'{self.status_file}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(status, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.status_file)
+
+    # ---------- 主循环 ----------
+    def run_once(self):
+        """执行当前所有到期任务，有变化时出图，返回距下一个任务的秒数"""
+        self.sync_keywords()
+        self.state = 'running'
+        changed = False
+        for task in self.due_tasks(time.time()):
+            if (task.source, task.keyword) not in self.tasks:
+                continue
+            changed |= self.run_task(task) and task.source == 'xiaohongshu'
+            self.write_status()
+        if changed:
+            self.render()
+        upcoming = min((t.next_run for t in self.tasks.values()), default=time.time() + POLL_SECONDS)
+        return max(0.0, upcoming - time.time())
+
+    def run_forever(self):
+        print("=" * 60)
+        print(f"关键词监测：来源 {', '.join(self.sources)}，状态文件 {self.status_file}")
+        print("=" * 60)
+        try:
+            while True:
+                wait = min(self.run_once(), POLL_SECONDS)
+                self.state = 'sleeping'
+                self.write_status()
+                time.sleep(wait)
+        except KeyboardInterrupt:
+            print("\n⏹  已停止监测")
+        finally:
+            self.state = 'stopped'
+            self.write_status()
+            for source in list(self.drivers):
+                self.drop_driver(source)
+
+
+def main(sources=SOURCES, max_workers=None, exclude_duplicates=False, status_file=STATUS_FILE):
+    Monitor(sources, status_file=status_file, max_workers=max_workers,
+            exclude_duplicates=exclude_duplicates).run_forever()
+
+
+if __name__ == '__main__':
+    main()
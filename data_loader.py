@@ -0,0 +1,151 @@
+"""
+data_loader.py   —— 分析数据加载与预聚合
+-------------------------------------------------------------
+功能：
+1. 读取各产品的“全平台Top20作品导出”文件并合并为一张表，
+   也可以接入爬虫数据（见 ingest.py），或由爬虫在同一进程内直接传入（use_data）
+2. 统一清理互动指标列，并按 schema.py 转换为紧凑类型（分类、可空小整数、日期）
+3. 预先计算各产品的均值/总和/最大值及均值的置信区间等汇总数据，供图表和表格共用
+
+加载结果和预聚合结果（load_summary）在进程内缓存，同一次运行中多个脚本/图表不会重复读取Excel、重复计算置信区间。
+"""
+
+from functools import lru_cache
+
+import pandas as pd
+
+import ingest
+import tracing
+from bootstrap import bootstrap_stats
+from schema import COUNT_COLUMNS, apply_schema, memory_report
+
+
+# 互动指标列
+METRICS = COUNT_COLUMNS
+
+# 产品名称 -> 导出文件
+PRODUCT_FILES = {
+    '固体杨枝甘露': '固体杨枝甘露-全平台Top20作品导出 1118~1218.xlsx',
+    '奶皮子糖葫芦': '奶皮子糖葫芦-全平台Top20作品导出 1118~1218.xlsx',
+}
+
+# 输出文件名中使用的产品简称
+PRODUCT_SHORT_NAMES = {
+    '固体杨枝甘露': '杨枝甘露',
+    '奶皮子糖葫芦': '奶皮子',
+}
+
+# 蓝绿色系低饱和度配色（按产品顺序循环使用）
+PRODUCT_COLORS = ['#5B9BA6', '#8FB3AB', '#A3C4BC', '#B5D4CB']
+
+
+def short_name(product):
+    """产品简称，用于输出文件名"""
+    return PRODUCT_SHORT_NAMES.get(product, product)
+
+
+def product_color(idx):
+    """第 idx 个产品的配色"""
+    return PRODUCT_COLORS[idx % len(PRODUCT_COLORS)]
+
+
+# 可选数据来源
+SOURCES = ['export', 'xiaohongshu', 'xinbang']
+
+# 通过 use_data / use_sources 指定的数据，优先于默认的导出文件
+_injected = None
+# 当前数据来源的名称（见 source_name）
+_source = 'export'
+
+
+def read_exports():
+    """读取 PRODUCT_FILES 中的全部导出文件"""
+    return ingest.combine(ingest.from_export(pd.read_excel(path), product)
+                          for product, path in PRODUCT_FILES.items())
+
+
+def read_sources(sources):
+    """按来源读取并合并为统一列的数据"""
+    readers = {
+        'export': read_exports,
+        'xiaohongshu': ingest.read_xiaohongshu,
+        'xinbang': ingest.read_xinbang,
+    }
+    return ingest.combine(readers[source]() for source in sources)
+
+
+def use_data(df, source):
+    """直接使用内存中的统一列数据（如爬虫刚抓取的结果），之后的 load_data 返回它
+
+    source 为数据来源的名称（如 'xiaohongshu'），见 source_name。
+    """
+    global _injected, _source
+    _injected = df
+    _source = source
+    load_data.cache_clear()
+    load_summary.cache_clear()
+
+
+def use_sources(sources):
+    """改用指定来源的数据文件"""
+    use_data(read_sources(sources), '+'.join(sources))
+
+
+def source_name():
+    """当前数据来源的名称：默认 'export'，多个来源用 + 连接（如 'xiaohongshu+xinbang'）
+
+    跨运行累积的记录（每日发布数量、互动分布草图）按来源分开保存，不同来源的数据不会混在一起。
+    """
+    return _source
+
+
+@lru_cache(maxsize=None)
+def load_data():
+    """读取所有产品的数据并合并，结果带“产品”列
+
+    返回值被缓存，调用方不应原地修改。加载时会打印类型转换前后的内存占用。
+    """
+    with tracing.span('读取数据'):
+        raw = read_exports() if _injected is None else _injected
+    categories = list(PRODUCT_FILES) if _injected is None else None
+    with tracing.span('类型转换'):
+        df_all = apply_schema(raw, categories=categories)
+    memory_report(raw, df_all)
+    return df_all
+
+
+def products(df_all):
+    """按出现顺序返回产品列表"""
+    return [p for p in pd.unique(df_all['产品']) if pd.notna(p)]
+
+
+@tracing.traced('预聚合')
+def aggregate(df_all):
+    """按产品预聚合互动指标
+
+    返回字典，除 'products' 外均以产品为索引：
+      mean / sum / max: DataFrame（列为各互动指标；来源中没有的指标均值/最大值为 NaN）
+      count: 作品数，accounts: 活跃账号数
+      ci: 均值/中位数的 Bootstrap 置信区间（见 bootstrap.bootstrap_stats）
+    """
+    order = products(df_all)
+    grouped = df_all.groupby('产品', sort=False, observed=True)
+    return {
+        'products': order,
+        'mean': grouped[METRICS].mean().astype(float).reindex(order),
+        'sum': grouped[METRICS].sum().reindex(order),
+        'max': grouped[METRICS].max().astype(float).reindex(order),
+        'count': grouped.size().reindex(order),
+        'accounts': grouped['账号'].nunique().reindex(order),
+        'ci': {key: frame.reindex(order)
+               for key, frame in bootstrap_stats(df_all, '产品', METRICS).items()},
+    }
+
+
+@lru_cache(maxsize=None)
+def load_summary():
+    """load_data() 的预聚合结果，与 load_data 一样缓存到数据来源改变为止
+
+    分析、高级图表和表格脚本在同一进程中运行时只需计算一次（置信区间的重抽样较耗时）。
+    """
+    return aggregate(load_data())
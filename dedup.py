@@ -0,0 +1,240 @@
+"""
+dedup.py   —— 标题近似重复检测（MinHash + LSH）
+-------------------------------------------------------------
+功能：
+1. 标题分词（jieba，按标题缓存），词频统计和去重共用同一份分词结果
+2. 以分词集合计算 MinHash 签名，用 LSH 分桶找候选，核对候选对的签名相似度
+3. 以中心聚类：按互动数从高到低取尚未归组的标题作为中心（即该组代表），
+   与中心的相似度达到阈值的标题并入该组，其余视为转载/轻微改写的重复
+4. 按产品分别检测：同一作品出现在多个产品（关键词）下时，每个产品各自保留，
+   词频、词云和 TOP作品 都通过 deduplicated 使用同一份去重结果
+
+不做全体两两比较：分词完全相同的标题先合并，签名和分桶都是数组运算，
+只在同一 LSH 桶内比较（大桶限制每条的比较次数），计算量随标题数近似线性增长。
+
+使用示例：
+    groups = near_duplicates(df['标题'])      # 列：重复组、代表
+    unique = deduplicated(df_all)            # 每个产品内只保留每组代表的数据表（按表缓存）
+"""
+
+import zlib
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import tracing
+
+
+# 签名长度、LSH 分段数（每段 NUM_PERM // BANDS 个哈希值）
+NUM_PERM = 128
+BANDS = 32
+# 签名相似度（Jaccard 估计值）不低于该值视为近似重复
+THRESHOLD = 0.6
+# 计算签名时每批处理的分词数，控制内存占用
+CHUNK_TOKENS = 200_000
+# LSH 桶内两两比较；超过该大小的桶（大量相似标题）每条只与桶内其后这么多条比较
+BUCKET_WINDOW = 5
+
+# id(DataFrame) -> (DataFrame, 去重后的 DataFrame)；保留引用以保证 id 不被复用
+_CACHE = {}
+
+
+@lru_cache(maxsize=None)
+def _cut(title):
+    # jieba 较重，只在真正分词时导入
+    import jieba
+
+    return tuple(w for w in jieba.cut(title) if len(w) > 1)
+
+
+def tokenize(title):
+    """标题分词，过滤单字（同一标题只分词一次）"""
+    return list(_cut(str(title)))
+
+
+def minhash_signatures(token_lists, num_perm=NUM_PERM, seed=0):
+    """每个分词集合的 MinHash 签名，返回 (标题数, num_perm) 的 uint32 数组
+
+    没有分词的标题签名全为最大值。
+    """
+    lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.int64)
+    signatures = np.full((len(token_lists), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    if not lengths.sum():
+        return signatures
+
+    flat = pd.Series([tok for tokens in token_lists for tok in tokens], dtype=object)
+    codes, uniques = pd.factorize(flat)
+    token_hash = np.array([zlib.crc32(tok.encode('utf-8')) for tok in uniques], dtype=np.uint64)
+
+    # multiply-shift 哈希族：h(x) = ((a*x + b) mod 2^64) >> 32，只对不重复的词计算一次
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+    hashed = ((token_hash[:, None] * a[None, :] + b[None, :]) >> np.uint64(32)).astype(np.uint32)
+    # 末尾加一行最大值，标题分词数不足时指向这一行
+    hashed = np.vstack([hashed, np.full((1, num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)])
+    sentinel = len(hashed) - 1
+
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    step = max(1, CHUNK_TOKENS // max(1, int(lengths.mean())))
+    for begin in range(0, len(token_lists), step):
+        docs = slice(begin, begin + step)
+        width = int(lengths[docs].max())
+        # (标题, 第j个词) 的词编号矩阵，逐列取最小值
+        offsets = np.arange(width)
+        positions = starts[docs, None] + offsets
+        present = offsets < lengths[docs, None]
+        token_codes = np.where(present, codes[np.where(present, positions, 0)], sentinel)
+        block = signatures[docs]
+        for j in range(width):
+            np.minimum(block, hashed[token_codes[:, j]], out=block)
+    return signatures
+
+
+def _candidate_pairs(signatures, bands, window, groups=None):
+    """LSH 分桶得到的候选对编号数组（left * 标题数 + right，left < right，已去重）
+
+    同一桶内的标题两两组成候选对；桶很大时每条只与桶内其后 window 条组成候选对。
+    groups 为各标题的分组编号时，只有同组的标题组成候选对。
+    """
+    m, num_perm = signatures.shape
+    rows = num_perm // bands
+    # 每段的若干哈希值合成一个64位桶键（键碰撞只会多出候选，之后仍要核对相似度）
+    mixers = np.random.default_rng(1).integers(0, 2 ** 63, rows + 1, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    salt = 0 if groups is None else np.asarray(groups).astype(np.uint64) * mixers[rows]
+    pairs = []
+    for band in range(bands):
+        keys = (signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) * mixers[:rows]).sum(axis=1) + salt
+        bucket, _ = pd.factorize(keys)
+        # 按桶排序（桶内保持原顺序），桶内相隔 k 条的两条组成候选对
+        order = np.argsort(bucket, kind='stable')
+        ordered = bucket[order]
+        for k in range(1, window + 1):
+            same = np.flatnonzero(ordered[k:] == ordered[:-k])
+            if not len(same):
+                break
+            pairs.append(order[same] * m + order[same + k])
+    if not pairs:
+        return np.empty(0, dtype=np.int64)
+    # 多个分段得到的相同候选对只保留一次（排序后去相邻重复，比 np.unique 快得多）
+    pairs = np.concatenate(pairs)
+    pairs.sort()
+    pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]
+    if groups is not None:
+        # 桶键碰撞时可能混入不同组的候选对
+        pairs = pairs[groups[pairs // m] == groups[pairs % m]]
+    return pairs
+
+
+def _cluster(signatures, pairs, order, threshold):
+    """以中心聚类：按 order 依次取尚未归组的节点作为中心，
+    与中心签名相似度达到 threshold 的未归组候选节点并入该组
+
+    组内每条都与中心直接相似，不会像传递闭包那样通过一串相似标题把不相关的标题连在一起。
+    只核对中心与其未归组候选之间的相似度，重复很多时大部分候选对不需要核对。
+    返回每个节点所在组的中心编号。
+    """
+    m, num_perm = signatures.shape
+    need = threshold * num_perm
+    # 候选邻接表（CSR）：节点 i 的候选为 neighbors[offsets[i]:offsets[i + 1]]
+    left, right = (pairs // m).astype(np.int32), (pairs % m).astype(np.int32)
+    del pairs
+    source = np.concatenate([left, right])
+    neighbors = np.concatenate([right, left])
+    del left, right
+    neighbors = neighbors[np.argsort(source, kind='stable')]
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(source, minlength=m))])
+    del source
+
+    centre = np.arange(m)
+    assigned = np.zeros(m, dtype=bool)
+    linked = offsets[1:] > offsets[:-1]
+    for node in order[linked[order]]:
+        if assigned[node]:
+            continue
+        assigned[node] = True
+        candidates = neighbors[offsets[node]:offsets[node + 1]]
+        candidates = candidates[~assigned[candidates]]
+        if not len(candidates):
+            continue
+        matches = np.count_nonzero(signatures[candidates] == signatures[node], axis=1)
+        members = candidates[matches >= need]
+        centre[members] = node
+        assigned[members] = True
+    return centre
+
+
+def near_duplicates(titles, priority=None, groups=None, threshold=THRESHOLD, num_perm=NUM_PERM,
+                    bands=BANDS, window=BUCKET_WINDOW):
+    """检测近似重复的标题
+
+    返回与 titles 同索引的 DataFrame：
+      重复组: 组编号（组内第一条标题的位置），不重复的标题单独成组
+      代表: 每组中 priority 最高的一条为 True（priority 为空时取最先出现的一条）
+    每组以 priority 最高的标题为中心，组内其余标题与中心的签名相似度都不低于 threshold。
+    groups（如 产品 列）不为空时只在同一组内检测，不同组的相同标题互不影响。
+    缺失或没有有效分词的标题不参与比较，各自为代表。
+    """
+    texts = titles.fillna('').astype(str)
+    token_lists = [tuple(sorted(set(_cut(t)))) if t else () for t in texts]
+    n = len(token_lists)
+    score = np.zeros(n) if priority is None else \
+        pd.Series(priority).astype('float64').fillna(-np.inf).to_numpy()
+    group = np.zeros(n, dtype=np.int64) if groups is None else \
+        pd.factorize(pd.Series(groups), use_na_sentinel=False)[0]
+
+    # 同组内分词集合完全相同的标题（直接转载）合并为一个节点，只计算一次签名、只参与一次比较
+    valid = np.array([bool(tokens) for tokens in token_lists])
+    docs = np.flatnonzero(valid)
+    keys = pd.Series([f'{group[i]}\x1e' + '\x1f'.join(token_lists[i]) for i in docs], dtype=object)
+    node, unique_keys = pd.factorize(keys)
+    m = len(unique_keys)
+    node_group = np.zeros(m, dtype=np.int64)
+    node_group[node] = group[docs]
+    signatures = minhash_signatures([key.split('\x1e', 1)[1].split('\x1f') for key in unique_keys],
+                                    num_perm)
+
+    # 中心按节点内最高的 priority 从高到低选取（相同时取先出现的）
+    node_score = np.full(m, -np.inf)
+    np.maximum.at(node_score, node, score[docs])
+    order = np.lexsort((np.arange(m), -node_score))
+    pairs = _candidate_pairs(signatures, bands, window, None if groups is None else node_group)
+    centre = _cluster(signatures, pairs, order, threshold)
+
+    # 组编号为组内第一条标题的位置
+    first = np.full(m, n)
+    np.minimum.at(first, centre[node], docs)
+    labels = np.arange(n)
+    labels[docs] = first[centre[node]]
+
+    # 每组取 priority 最高者（相同时取位置靠前者）
+    order = np.lexsort((np.arange(n), -score, labels))
+    is_first = np.ones(n, dtype=bool)
+    is_first[1:] = labels[order][1:] != labels[order][:-1]
+    representative = np.zeros(n, dtype=bool)
+    representative[order[is_first]] = True
+
+    return pd.DataFrame({'重复组': labels, '代表': representative}, index=titles.index)
+
+
+def deduplicated(df):
+    """去掉近似重复作品后的数据表，每个产品内每组保留互动数最高的一条（同一张表只计算一次）"""
+    if id(df) not in _CACHE:
+        from ranking import interaction_score
+
+        products = df['产品'] if '产品' in df.columns else None
+        with tracing.span('近似重复检测', rows=len(df)):
+            groups = near_duplicates(df['标题'], priority=interaction_score(df), groups=products)
+        unique = df[groups['代表'].to_numpy()]
+        removed = len(df) - len(unique)
+        if removed:
+            print(f"🧹 近似重复标题 {removed} 条，已保留每组互动最高的一条")
+        _CACHE[id(df)] = (df, unique)
+    return _CACHE[id(df)][1]
+
+
+def clear_cache():
+    """释放去重结果和分词缓存（长时间运行时调用，避免旧表和旧标题一直占用内存）"""
+    _CACHE.clear()
+    _cut.cache_clear()
@@ -0,0 +1,151 @@
+"""
+fonts.py   —— 跨平台中文字体查找（带缓存）
+-------------------------------------------------------------
+查找顺序：
+1. 环境变量 CJK_FONT_PATH 指定的字体文件
+2. 项目 assets/fonts/ 目录下自带的字体（如 NotoSansSC-Regular.otf，各平台渲染一致）
+3. 各系统常见的中文字体路径（Windows 黑体/雅黑、macOS 苹方、Linux Noto/文泉驿）
+4. fontconfig（fc-list :lang=zh）
+
+查找结果写入 .font_cache.json，之后的运行（包括渲染子进程）直接读取，
+不再扫描系统目录或调用 fc-list。缓存同时记录当时 assets/fonts/ 中的字体列表，
+之后放入（或删除）自带字体时重新查找，不需要手动删除缓存文件。
+找到的字体同时用于 matplotlib 和 WordCloud。
+"""
+
+import json
+import os
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+
+
+PROJECT_DIR = Path(__file__).resolve().parent
+BUNDLED_FONT_DIR = PROJECT_DIR / 'assets' / 'fonts'
+CACHE_FILE = PROJECT_DIR / '.font_cache.json'
+FONT_EXTENSIONS = ('.ttf', '.ttc', '.otf')
+
+# 各系统常见的中文字体文件
+SYSTEM_FONT_PATHS = [
+    r'C:\Windows\Fonts\simhei.ttf',
+    r'C:\Windows\Fonts\msyh.ttc',
+    '/System/Library/Fonts/PingFang.ttc',
+    '/System/Library/Fonts/STHeiti Medium.ttc',
+    '/Library/Fonts/Arial Unicode.ttf',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',
+    '/usr/share/fonts/wqy-microhei/wqy-microhei.ttc',
+]
+
+# 找不到字体文件时交给 matplotlib 按名称匹配
+FALLBACK_FAMILIES = ['SimHei', 'Microsoft YaHei', 'PingFang SC', 'Noto Sans CJK SC',
+                     'WenQuanYi Micro Hei', 'Arial Unicode MS']
+
+# fontconfig 结果中优先选用的字体
+PREFERRED_KEYWORDS = ['NotoSansCJK', 'NotoSansSC', 'SourceHanSans', 'wqy-microhei',
+                      'wqy-zenhei', 'simhei', 'msyh']
+
+
+def _bundled_fonts():
+    if not BUNDLED_FONT_DIR.is_dir():
+        return []
+    return sorted(str(p) for p in BUNDLED_FONT_DIR.iterdir()
+                  if p.suffix.lower() in FONT_EXTENSIONS)
+
+
+def _fontconfig_fonts():
+    """通过 fc-list 查找支持中文的字体，按偏好排序"""
+    try:
+        out = subprocess.run(['fc-list', ':lang=zh', 'file'], capture_output=True,
+                             text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+    files = [line.split(':')[0].strip() for line in out.splitlines() if line.strip()]
+
+    def rank(path):
+        name = Path(path).name.lower()
+        for i, keyword in enumerate(PREFERRED_KEYWORDS):
+            if keyword.lower() in name:
+                return i
+        return len(PREFERRED_KEYWORDS)
+
+    return sorted(files, key=rank)
+
+
+def _search():
+    configured = os.environ.get('CJK_FONT_PATH')
+    if configured:
+        if Path(configured).is_file():
+            return configured
+        print(f"⚠️  CJK_FONT_PATH 指定的字体不存在: {configured}")
+
+    for path in _bundled_fonts() + SYSTEM_FONT_PATHS:
+        if Path(path).is_file():
+            return path
+    for path in _fontconfig_fonts():
+        if Path(path).is_file():
+            return path
+    return None
+
+
+def _read_cache():
+    try:
+        return json.loads(CACHE_FILE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+@lru_cache(maxsize=None)
+def find_cjk_font():
+    """返回中文字体文件路径，找不到时返回 None"""
+    configured = os.environ.get('CJK_FONT_PATH')
+    bundled = _bundled_fonts()
+    cached = _read_cache()
+    if cached.get('configured') == configured and cached.get('bundled') == bundled \
+            and cached.get('path') and Path(cached['path']).is_file():
+        return cached['path']
+
+    path = _search()
+    if path is None:
+        print("⚠️  未找到中文字体，请设置 CJK_FONT_PATH 或将字体放入 assets/fonts/ 目录")
+        return None
+    try:
+        CACHE_FILE.write_text(json.dumps({'configured': configured, 'bundled': bundled, 'path': path},
+                                         ensure_ascii=False), encoding='utf-8')
+    except OSError:
+        pass
+    return path
+
+
+@lru_cache(maxsize=None)
+def _register_font(path):
+    """把字体文件注册给 matplotlib（不触发字体缓存重建），返回字体名称"""
+    from matplotlib import font_manager
+
+    font_manager.fontManager.addfont(path)
+    return font_manager.FontProperties(fname=path).get_name()
+
+
+def setup_matplotlib():
+    """设置 matplotlib 默认无衬线字体为中文字体，返回字体名称
+
+    seaborn.set_style 会覆盖 font.sans-serif，需在其之后调用。
+    """
+    import matplotlib.pyplot as plt
+
+    plt.rcParams['axes.unicode_minus'] = False
+    path = find_cjk_font()
+    if path is None:
+        plt.rcParams['font.sans-serif'] = FALLBACK_FAMILIES
+        return None
+
+    name = _register_font(path)
+    plt.rcParams['font.sans-serif'] = [name] + FALLBACK_FAMILIES
+    return name
+
+
+def wordcloud_font():
+    """WordCloud 使用的字体文件路径（None 时使用 WordCloud 自带字体）"""
+    return find_cjk_font()
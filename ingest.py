@@ -0,0 +1,151 @@
+"""
+ingest.py   —— 多来源数据统一接入
+-------------------------------------------------------------
+把三种来源的数据映射到同一套列（见 CANONICAL_COLUMNS），直接交给分析脚本使用：
+
+  来源           原始列                                       → 统一列
+  export        标题/账号/发布时间/获赞数/评论数/分享数/收藏数   → 原样保留
+  xiaohongshu   标题/用户/发布日期/点赞数/评论数/链接           → 账号/发布时间/获赞数/评论数
+  xinbang       keyword/title/like/comment/share              → 产品/标题/获赞数/评论数/分享数
+
+来源中没有的列填为缺失值（如小红书没有分享数/收藏数，新榜没有账号/发布时间）。
+小红书的相对发布时间（'3天前'、'昨天 12:30'）按每行的 爬取时间 换算为绝对时间。
+爬虫在同一进程内把 DataFrame 交给 from_* 函数即可，不需要先写 Excel 再读回。
+"""
+
+import re
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from schema import COUNT_COLUMNS
+
+
+CANONICAL_COLUMNS = ['产品', '标题', '账号', '发布时间'] + COUNT_COLUMNS + ['链接', '来源']
+
+# 各来源的列名映射
+XIAOHONGSHU_COLUMNS = {'用户': '账号', '发布日期': '发布时间', '点赞数': '获赞数'}
+XINBANG_COLUMNS = {'keyword': '产品', 'title': '标题', 'like': '获赞数',
+                   'comment': '评论数', 'share': '分享数'}
+
+# 爬虫填写的占位值，统一视为缺失
+PLACEHOLDERS = {'未知', '无', ''}
+
+XIAOHONGSHU_FILE = 'xiaohongshu_data.xlsx'
+XINBANG_CONTENT_FILE = 'content_meta.csv'
+
+
+def parse_count(value):
+    """把 '1.2万'、'3.5w'、'2k'、'1,024' 等计数文本转换为数字，无法识别时返回缺失"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return pd.NA
+    if isinstance(value, (int, float)):
+        return value
+    text = str(value).strip().lower().replace(',', '')
+    match = re.search(r'(\d+(?:\.\d+)?)\s*(万|w|k|千)?', text)
+    if not match:
+        return pd.NA
+    number = float(match.group(1))
+    unit = match.group(2)
+    if unit in ('万', 'w'):
+        number *= 10000
+    elif unit in ('k', '千'):
+        number *= 1000
+    return round(number)
+
+
+def parse_publish_time(value, now=None):
+    """解析小红书的发布时间文本：'2024-11-18'、'11-18'、'3天前'、'5小时前'、'昨天 12:30' 等
+
+    相对时间和不带年份的日期以 now（爬取时间）为基准，默认为当前时间。
+    """
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return pd.NaT
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return pd.Timestamp(value)
+    now = now or datetime.now()
+    text = str(value).strip()
+
+    relative = re.match(r'(\d+)\s*(分钟|小时|天)前', text)
+    if relative:
+        amount, unit = int(relative.group(1)), relative.group(2)
+        delta = {'分钟': timedelta(minutes=amount), '小时': timedelta(hours=amount),
+                 '天': timedelta(days=amount)}[unit]
+        return pd.Timestamp(now - delta)
+    if text.startswith(('今天', '昨天', '前天')):
+        days = {'今天': 0, '昨天': 1, '前天': 2}[text[:2]]
+        day = (now - timedelta(days=days)).strftime('%Y-%m-%d')
+        return pd.to_datetime(f'{day} {text[2:].strip()}'.strip(), errors='coerce')
+    if re.fullmatch(r'\d{1,2}-\d{1,2}', text):
+        # 当年的笔记只显示月-日；比爬取时间还晚的是跨年前（如 1 月看到的 '12-28'）的笔记
+        date = pd.to_datetime(f'{now.year}-{text}', errors='coerce')
+        if date > now + timedelta(days=1):
+            date -= pd.DateOffset(years=1)
+        return date
+    return pd.to_datetime(text, errors='coerce')
+
+
+def _finish(df, source):
+    """补齐缺失列、统一占位值并排好列顺序"""
+    for col in ('标题', '账号', '链接'):
+        if col in df.columns:
+            df[col] = df[col].where(~df[col].astype(str).str.strip().isin(PLACEHOLDERS))
+    df['来源'] = source
+    for col in CANONICAL_COLUMNS:
+        if col not in df.columns:
+            df[col] = pd.NA
+    return df[CANONICAL_COLUMNS]
+
+
+def from_export(df, product):
+    """“全平台Top20作品导出”文件"""
+    df = df.copy()
+    df['产品'] = product
+    for col in COUNT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return _finish(df, 'export')
+
+
+def from_xiaohongshu(df, keyword):
+    """xiaohongshu_spider 爬取的单个关键词结果"""
+    df = df.rename(columns=XIAOHONGSHU_COLUMNS)
+    df['产品'] = keyword
+    for col in ('获赞数', '评论数'):
+        if col in df.columns:
+            df[col] = df[col].map(parse_count)
+    if '发布时间' in df.columns:
+        # 相对时间以每行的爬取时间为基准；旧数据没有爬取时间时以当前时间为基准
+        crawled = (pd.to_datetime(df['爬取时间'], errors='coerce') if '爬取时间' in df.columns
+                   else pd.Series(pd.NaT, index=df.index))
+        df['发布时间'] = [parse_publish_time(value, None if pd.isna(at) else at)
+                       for value, at in zip(df['发布时间'], crawled)]
+    return _finish(df, 'xiaohongshu')
+
+
+def from_xinbang(df):
+    """xinbang_spider 的内容列表（content_meta），按 keyword 区分产品"""
+    df = df.rename(columns=XINBANG_COLUMNS)
+    for col in ('获赞数', '评论数', '分享数'):
+        if col in df.columns:
+            df[col] = df[col].map(parse_count)
+    return _finish(df, 'xinbang')
+
+
+def combine(frames):
+    """合并多个已统一列的数据表"""
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=CANONICAL_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_xiaohongshu(path=XIAOHONGSHU_FILE):
+    """读取爬虫保存的 xiaohongshu_data.xlsx（每个关键词一个Sheet）"""
+    sheets = pd.read_excel(path, sheet_name=None)
+    return combine(from_xiaohongshu(df, keyword) for keyword, df in sheets.items())
+
+
+def read_xinbang(path=XINBANG_CONTENT_FILE):
+    """读取爬虫保存的 content_meta.csv"""
+    return from_xinbang(pd.read_csv(path, encoding='utf-8-sig'))
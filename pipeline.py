@@ -0,0 +1,185 @@
+"""
+pipeline.py   —— 爬取 → 解析 → 存储 → 出图 流水线
+-------------------------------------------------------------
+功能：
+1. 小红书爬虫每爬完一个关键词，就把结果交给后续阶段，不必等全部关键词爬完
+2. 解析、存储、出图各在一个线程中运行，阶段之间用有容量上限的队列连接：
+   关键词A在出图时，浏览器已经在爬关键词B
+3. 下游处理不过来时，上游放入队列会阻塞等待（背压），爬取过程中内存里只有队列中几个关键词的数据
+4. 出图阶段只生成该关键词自己的输出（词云、TOP作品、活跃账号）；
+   全部关键词完成后，从 xiaohongshu_data.xlsx 重新读取本次写入的全部 Sheet，
+   只生成各产品对比类的图表和表格（各关键词自己的输出不再重复生成）
+
+解析：统一列（ingest.from_xiaohongshu）；存储：把该关键词的 Sheet 写入 xiaohongshu_data.xlsx
+（每个关键词写完即落盘，中途中断时已完成的关键词不会丢失）。
+存储后不保留该关键词的数据，出图后释放它的排行/去重缓存。
+某个关键词在某一阶段出错时只打印提示，不影响其他关键词。
+
+使用示例：
+    python cli.py pipeline --dedup
+"""
+
+import importlib
+import queue
+import threading
+from collections import namedtuple
+from functools import partial
+
+import data_loader
+import dedup
+import ingest
+import ranking
+import tracing
+import xiaohongshu_spider
+from analysis import product_jobs as analysis_jobs, word_frequencies
+from render_pool import run_jobs
+from schema import apply_schema
+from table_generator import product_jobs as table_jobs
+
+
+# 各阶段之间队列的容量（关键词数）
+QUEUE_SIZE = 2
+
+# 全部关键词完成后生成对比类输出的脚本；前两个支持 exclude_duplicates，
+# 并且含有各产品自己的输出（product_outputs）
+FINAL_MODULES = ['analysis', 'advanced_charts', 'table_generator']
+DEDUP_MODULES = {'analysis', 'table_generator'}
+
+# 一个关键词在流水线中传递的数据：原始爬取结果、统一列的数据
+Batch = namedtuple('Batch', ['keyword', 'raw', 'data'])
+
+# 队列结束标记
+_STOP = object()
+
+
+class Stage(threading.Thread):
+    """流水线的一个阶段：从 inbox 取数据处理，结果放入 outbox（为空时不传递）"""
+
+    def __init__(self, name, func, inbox, outbox=None):
+        super().__init__(name=name, daemon=True)
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+
+    def run(self):
+        while True:
+            item = self.inbox.get()
+            if item is _STOP:
+                if self.outbox is not None:
+                    self.outbox.put(_STOP)
+                return
+            try:
+                with tracing.span(self.name, category='pipeline', keyword=item.keyword):
+                    result = self.func(item)
+            except Exception as e:
+                print(f"  ⚠️  {self.name}失败 '{item.keyword}': {e}")
+                continue
+            if self.outbox is not None:
+                # 队列已满时阻塞，直到下游取走数据
+                self.outbox.put(result)
+
+
+def parse(batch):
+    """原始爬取结果转为统一列"""
+    return batch._replace(data=ingest.from_xiaohongshu(batch.raw, batch.keyword))
+
+
+def store(stored, batch):
+    """写入 Excel（本次运行的第一个关键词新建文件），stored 记录已写入的关键词"""
+    xiaohongshu_spider.save_sheet(xiaohongshu_spider.OUTPUT_FILE, batch.keyword, batch.raw,
+                                  new_file=not stored)
+    stored.append(batch.keyword)
+    return batch
+
+
+def render(batch, exclude_duplicates=False):
+    """生成该关键词（产品）自己的词云、TOP作品和活跃账号表（在当前进程中渲染）"""
+    df = apply_schema(batch.data)
+    try:
+        titles = dedup.deduplicated(df) if exclude_duplicates else df
+        jobs = analysis_jobs(batch.keyword, word_frequencies(titles['标题']))
+        jobs += table_jobs(df, batch.keyword, exclude_duplicates=exclude_duplicates)
+        run_jobs(jobs, max_workers=1)
+    finally:
+        # 排行/去重结果按表缓存，不释放的话每个关键词的数据都会一直留在内存中
+        ranking.clear_cache()
+        dedup.clear_cache()
+    print(f"  🖼  关键词 '{batch.keyword}' 的图表已生成")
+
+
+def crawl(keywords, inbox, plans=None):
+    """在当前线程中运行浏览器，每爬完一个关键词放入 inbox"""
+    session = xiaohongshu_spider.ManagedDriver()
+    try:
+        session.start()
+        for keyword, df in xiaohongshu_spider.crawl_keywords(session, keywords, plans):
+            inbox.put(Batch(keyword, df, None))
+    except Exception as e:
+        print(f"\n❌ 爬取出错: {e}")
+    finally:
+        print("\n关闭浏览器...")
+        session.quit()
+
+
+def render_final(max_workers=None, exclude_duplicates=False, product_outputs=True):
+    """用全部关键词的数据生成对比类图表和表格
+
+    product_outputs 为 False 时不生成各产品自己的输出（流水线中已按关键词生成过）。
+    """
+    for name in FINAL_MODULES:
+        options = {}
+        if name in DEDUP_MODULES:
+            options = {'exclude_duplicates': exclude_duplicates, 'product_outputs': product_outputs}
+        importlib.import_module(name).main(max_workers=max_workers, **options)
+
+
+def main(keywords=None, max_workers=None, exclude_duplicates=False, queue_size=QUEUE_SIZE, plans=None):
+    """运行流水线，返回本次写入的全部关键词合并后的统一列数据（从 xiaohongshu_data.xlsx 重新读取）
+
+    浏览器（需要在终端确认登录）在主线程中运行，解析/存储/出图在后台线程中运行。
+    max_workers 只用于最后的对比类图表，每个关键词的输出在出图线程中串行渲染。
+    plans 为 crawl_planner.plan_crawl 的结果时，按计划的顺序、笔记数和滚动次数爬取（空计划时不爬取）。
+    """
+    if plans is not None:
+        keywords = [plan.keyword for plan in plans]
+        plans = {plan.keyword: plan for plan in plans}
+    keywords = xiaohongshu_spider.load_keywords() if keywords is None else keywords
+    if not keywords:
+        print("⚠️  没有需要爬取的关键词")
+        return ingest.combine([])
+    parse_queue, store_queue, render_queue = (queue.Queue(maxsize=queue_size) for _ in range(3))
+    stored = []
+
+    print("=" * 60)
+    print(f"流水线：{len(keywords)} 个关键词，队列容量 {queue_size}")
+    print("=" * 60)
+
+    stages = [
+        Stage('解析', parse, parse_queue, store_queue),
+        Stage('存储', partial(store, stored), store_queue, render_queue),
+        Stage('出图', partial(render, exclude_duplicates=exclude_duplicates), render_queue),
+    ]
+    for stage in stages:
+        stage.start()
+    try:
+        crawl(keywords, parse_queue, plans)
+    finally:
+        # 结束标记依次传到每个阶段，等后台线程处理完已爬取的关键词
+        parse_queue.put(_STOP)
+        for stage in stages:
+            stage.join()
+
+    if not stored:
+        print("⚠️  没有爬取到数据，跳过对比类图表")
+        return ingest.combine([])
+
+    # 各关键词的数据在存储后已释放，从文件中重新读取（文件中只有本次写入的关键词）
+    data_loader.use_sources(['xiaohongshu'])
+    combined = data_loader.load_data()
+    print(f"\n✅ 爬取完成（{len(stored)} 个关键词，{len(combined)} 条），生成对比类图表...")
+    render_final(max_workers, exclude_duplicates, product_outputs=False)
+    return combined
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+quantile_sketch.py   —— 可合并的分位数草图（KLL）
+-------------------------------------------------------------
+功能：
+1. KLLSketch：流式更新的分位数草图，内存只与精度参数 k 有关，与数据量无关
+2. 草图可以合并（不同日期、不同产品），也可以保存为字典后再读回
+3. 按 (产品, 日期, 指标) 保存草图，每次运行只用新数据覆盖其涉及的 (产品, 日期)，
+   再按产品合并所有日期，不必保留以前的原始数据（与 timeseries 的每日发布数量相同）
+4. box_stats：由草图得到箱线图统计量（四分位数、须线、离群点），供 Axes.bxp 绘图
+
+数据量不超过 k 时草图保存全部数值，结果与精确计算一致；
+数据量更大时分位数的秩误差约为 1.7/k（k=200 时约 1%）。
+"""
+
+import json
+
+import numpy as np
+
+
+class KLLSketch:
+    """KLL 分位数草图
+
+    第 h 层的每个数值代表 2**h 个原始数值；某层装满时排序后隔一取一压缩到上一层。
+    压缩时的取舍偏移由 seed 决定，相同输入得到相同结果。
+    """
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values):
+        """加入一批数值（缺失值会被忽略）"""
+        values = np.asarray(values, dtype='float64').ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.n += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """合并另一个草图（原地修改并返回自身）"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        while sum(len(items) for items in self.levels) > \
+                sum(self._capacity(h) for h in range(len(self.levels))):
+            for h, items in enumerate(self.levels):
+                if len(items) >= self._capacity(h):
+                    break
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[h])
+            # 奇数个时留下一个，其余隔一取一升到上一层
+            keep, items = items[:len(items) % 2], items[len(items) % 2:]
+            promoted = items[self._rng.integers(2)::2]
+            self.levels[h] = keep
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def _weighted(self):
+        """全部保留值（升序）及其权重"""
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype='int64')
+                                  for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], weights[order]
+
+    def quantiles(self, qs):
+        """一次查询多个分位数（qs 取值 0~1）"""
+        qs = np.atleast_1d(np.asarray(qs, dtype='float64'))
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        items, weights = self._weighted()
+        cumulative = np.cumsum(weights)
+        # 与 numpy 'linear' 方法一致：秩 q*(n-1)，相邻两个值线性插值
+        ranks = qs * (cumulative[-1] - 1)
+        lower = np.floor(ranks)
+        lo = items[np.searchsorted(cumulative, lower, side='right')]
+        hi = items[np.searchsorted(cumulative, np.minimum(lower + 1, cumulative[-1] - 1),
+                                   side='right')]
+        out = lo + (hi - lo) * (ranks - lower)
+        out[qs <= 0] = self.min
+        out[qs >= 1] = self.max
+        return out
+
+    def quantile(self, q):
+        return float(self.quantiles([q])[0])
+
+    def to_dict(self):
+        """转为可保存（如 JSON）的字典"""
+        return {'k': self.k, 'n': self.n, 'min': float(self.min), 'max': float(self.max),
+                'levels': [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data, seed=0):
+        sketch = cls(k=data['k'], seed=seed)
+        sketch.n = data['n']
+        sketch.min, sketch.max = data['min'], data['max']
+        sketch.levels = [np.asarray(items, dtype='float64') for items in data['levels']]
+        return sketch
+
+
+def sketch_groups(df, by, columns, k=200):
+    """按 by 分组，为每组的每个数值列建立草图，返回 {(组, 列): KLLSketch}"""
+    sketches = {}
+    for key, group in df.groupby(by, sort=False, observed=True):
+        for col in columns:
+            values = group[col].to_numpy(dtype='float64', na_value=np.nan)
+            sketches[key, col] = KLLSketch(k=k).update(values)
+    return sketches
+
+
+def daily_sketches(df, columns, k=200):
+    """按 (产品, 发布日期) 为每个数值列建立草图，返回 {(产品, 'YYYY-MM-DD', 列): KLLSketch}
+
+    没有发布时间的作品记在日期 '' 下。
+    """
+    days = df['发布时间'].dt.strftime('%Y-%m-%d').fillna('')
+    sketches = sketch_groups(df.assign(发布日期=days), ['产品', '发布日期'], columns, k)
+    return {(product, day, col): sketch for ((product, day), col), sketch in sketches.items()}
+
+
+def update_sketches(cached, fresh):
+    """fresh 中的 (产品, 日期) 以 fresh 为准（该日期的全部指标一起替换），其余沿用 cached"""
+    covered = {key[:2] for key in fresh}
+    merged = {key: sketch for key, sketch in (cached or {}).items() if key[:2] not in covered}
+    merged.update(fresh)
+    return merged
+
+
+def merge_days(sketches, k=200):
+    """按 (产品, 列) 合并所有日期的草图（按日期顺序合并，相同输入得到相同结果）"""
+    merged = {}
+    for product, day, col in sorted(sketches, key=lambda key: (str(key[0]), key[1], key[2])):
+        merged.setdefault((product, col), KLLSketch(k=k)).merge(sketches[product, day, col])
+    return merged
+
+
+def save_sketches(sketches, path):
+    """保存 {(产品, 日期, 列): 草图}（JSON：产品 -> 日期 -> 列 -> 草图字典）"""
+    data = {}
+    for (product, day, col), sketch in sketches.items():
+        data.setdefault(str(product), {}).setdefault(day, {})[col] = sketch.to_dict()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def load_sketches(path):
+    """读取 save_sketches 保存的草图，文件不存在时返回 None"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    return {(product, day, col): KLLSketch.from_dict(sketch)
+            for product, days in data.items()
+            for day, columns in days.items()
+            for col, sketch in columns.items()}
+
+
+def box_stats(sketch, label=None, whis=1.5, max_outliers=20):
+    """由草图计算 Axes.bxp 需要的箱线图统计量
+
+    须线延伸到四分位距 whis 倍以内最远的保留值；离群点取草图中落在须线外的保留值，
+    最多 max_outliers 个（优先保留离中位数最远的）。草图为空时返回 None。
+    """
+    if sketch.n == 0:
+        return None
+    q1, med, q3 = sketch.quantiles([0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    low_fence, high_fence = q1 - whis * iqr, q3 + whis * iqr
+
+    items, _ = sketch._weighted()
+    items = np.unique(np.concatenate([items, [sketch.min, sketch.max]]))
+    inside = items[(items >= low_fence) & (items <= high_fence)]
+    outside = items[(items < low_fence) | (items > high_fence)]
+    if len(outside) > max_outliers:
+        outside = outside[np.argsort(-np.abs(outside - med), kind='stable')[:max_outliers]]
+
+    return {
+        'label': label,
+        'med': med, 'q1': q1, 'q3': q3,
+        'whislo': inside.min() if len(inside) else q1,
+        'whishi': inside.max() if len(inside) else q3,
+        'fliers': np.sort(outside),
+    }
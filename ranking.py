@@ -0,0 +1,98 @@
+"""
+ranking.py   —— 各产品 TOP作品 / 活跃账号 排行索引
+-------------------------------------------------------------
+功能：
+1. 互动数（获赞+评论+分享+收藏）只计算一次，不复制整张表
+2. 一次分组遍历同时得到所有产品的 TOP作品 和 活跃账号
+3. 索引按数据表缓存，表格、图表、摘要都可以直接查询“产品X的前N名”
+
+使用示例：
+    ranking = ranking_for(df_all)
+    ranking.top_works('固体杨枝甘露', 8)
+    ranking.top_accounts('奶皮子糖葫芦', 10)
+"""
+
+import pandas as pd
+
+from data_loader import METRICS
+from schema import widen
+
+
+# 索引中为每个产品预先保留的名次数，查询不超过该值时无需重新计算
+MAX_K = 50
+
+WORK_COLUMNS = ['标题', '账号', '获赞数', '评论数', '互动数']
+
+# id(DataFrame) -> (DataFrame, RankingIndex)；保留 DataFrame 引用以保证 id 不被复用
+_CACHE = {}
+
+
+def interaction_score(df):
+    """互动数 = 获赞 + 评论 + 分享 + 收藏
+
+    缺失的指标按0计（部分来源没有分享数/收藏数），四项全部缺失时为缺失。
+    各列先放宽到 Int64/float64，避免紧凑整数类型相加溢出。
+    """
+    columns = [widen(df[col]) for col in METRICS]
+    score = columns[0].fillna(0)
+    missing = columns[0].isna()
+    for col in columns[1:]:
+        score = score + col.fillna(0)
+        missing &= col.isna()
+    return score.mask(missing).rename('互动数')
+
+
+class RankingIndex:
+    """按产品预先排好序的 TOP作品 / 活跃账号"""
+
+    def __init__(self, df, max_k=MAX_K):
+        self.df = df
+        self.max_k = max_k
+        self.score = interaction_score(df)
+        products = df['产品']
+
+        # TOP作品：每个产品互动数最高的 max_k 条的行号
+        top = self.score.groupby(products, sort=False, observed=True).nlargest(max_k)
+        self._work_rows = {
+            product: rows.index.get_level_values(-1)
+            for product, rows in top.groupby(level=0, sort=False)
+        }
+
+        # 活跃账号：每个产品的账号作品数，按作品数降序（同数时保持首次出现顺序）
+        counts = df.groupby([products, df['账号']], sort=False, observed=True).size()
+        counts = counts.sort_values(ascending=False, kind='stable')
+        self._accounts = {
+            product: rows.droplevel(0).head(max_k)
+            for product, rows in counts.groupby(level=0, sort=False)
+        }
+
+    def top_works(self, product, top_n=8):
+        """互动数最高的作品，列为 标题/账号/获赞数/评论数/互动数，名次从1开始"""
+        if top_n > self.max_k:
+            return RankingIndex(self.df, top_n).top_works(product, top_n)
+        rows = self._work_rows.get(product, pd.Index([]))[:top_n]
+        top = self.df.loc[rows, WORK_COLUMNS[:-1]].assign(互动数=self.score.loc[rows])
+        top = top.reset_index(drop=True)
+        top.index = top.index + 1
+        return top
+
+    def top_accounts(self, product, top_n=10):
+        """作品数最多的账号，列为 账号/作品数，名次从1开始"""
+        if top_n > self.max_k:
+            return RankingIndex(self.df, top_n).top_accounts(product, top_n)
+        counts = self._accounts.get(product, pd.Series(dtype='int64')).head(top_n)
+        accounts = pd.DataFrame({'账号': counts.index, '作品数': counts.values})
+        accounts.index = accounts.index + 1
+        return accounts
+
+
+def ranking_for(df):
+    """返回 df 的排行索引（同一张表只构建一次）"""
+    if id(df) not in _CACHE:
+        _CACHE[id(df)] = (df, RankingIndex(df))
+    return _CACHE[id(df)][1]
+
+
+def clear_cache():
+    """释放已缓存的排行索引（数据更新后长时间运行时调用，避免旧表一直占用内存）"""
+    _CACHE.clear()
@@ -0,0 +1,160 @@
+"""
+render_pool.py   —— 图表并行渲染调度器
+-------------------------------------------------------------
+功能：
+1. 每张图表/表格图片作为一个独立任务，提交到进程池并行渲染
+2. 子进程统一使用 Agg 后端（无界面，适合批量出图）
+3. 预聚合数据在子进程初始化时只传递一次，各任务通过 SharedRef 引用
+4. 渲染结束后输出每张图的耗时
+5. 输入数据和参数未变化的输出直接跳过（见 build_cache.py）
+6. 启用 tracing 时每个任务记录一个阶段，子进程的记录随结果传回主进程
+
+使用示例：
+    jobs = [RenderJob('互动数据雷达图.png', create_radar_chart, (SharedRef('summary'),))]
+    run_jobs(jobs, shared={'summary': summary})
+"""
+
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import tracing
+from build_cache import BuildCache, fingerprint
+
+
+# 一个渲染任务：输出文件名、渲染函数（需可在模块顶层导入）、参数。
+# 渲染函数写出多个文件（分页、HTML、CSV）时返回文件路径列表，否则只记录输出文件名
+RenderJob = namedtuple('RenderJob', ['name', 'func', 'args', 'kwargs'])
+RenderJob.__new__.__defaults__ = ((), None)
+
+# 对共享数据的引用，在子进程中替换为实际对象
+SharedRef = namedtuple('SharedRef', ['key'])
+
+# 子进程中的共享数据
+_SHARED = {}
+
+
+def _init_worker(shared, trace=False):
+    """子进程初始化：切换 Agg 后端并接收共享数据"""
+    import matplotlib
+    matplotlib.use('Agg')
+    _SHARED.clear()
+    _SHARED.update(shared or {})
+    if trace:
+        tracing.enable()
+
+
+def _resolve(value, shared=None):
+    if isinstance(value, SharedRef):
+        return (_SHARED if shared is None else shared)[value.key]
+    return value
+
+
+def job_key(job, shared=None):
+    """任务指纹：渲染函数 + 实际输入数据 + 参数"""
+    args = [_resolve(a, shared or {}) for a in job.args]
+    kwargs = {k: _resolve(v, shared or {}) for k, v in (job.kwargs or {}).items()}
+    return fingerprint(job.func, args, kwargs)
+
+
+def _run_job(job):
+    """执行单个任务，返回 (耗时（秒）, 写出的文件列表)"""
+    args = [_resolve(a) for a in job.args]
+    kwargs = {k: _resolve(v) for k, v in (job.kwargs or {}).items()}
+    start = time.perf_counter()
+    with tracing.span(job.name, category='render'):
+        written = job.func(*args, **kwargs)
+    files = list(written) if isinstance(written, (list, tuple)) and written else [job.name]
+    return time.perf_counter() - start, files
+
+
+def _init_pool_worker(shared, trace=False):
+    """进程池子进程初始化：fork 出的子进程会带着主进程已有的记录，先清空"""
+    tracing.collect()
+    _init_worker(shared, trace)
+
+
+def _run_job_in_worker(job):
+    """子进程中执行任务，返回 (耗时, 写出的文件, 本任务的 tracing 记录)"""
+    return (*_run_job(job), tracing.collect())
+
+
+def select_jobs(jobs, only=None):
+    """按输出文件名筛选任务；only 为空时返回全部"""
+    if not only:
+        return list(jobs)
+    selected = [job for job in jobs if job.name in only]
+    missing = set(only) - {job.name for job in selected}
+    for name in sorted(missing):
+        print(f"  ⚠️  未找到输出: {name}")
+    return selected
+
+
+def default_workers():
+    """默认进程数：CPU核数，至少1个"""
+    return max(1, os.cpu_count() or 1)
+
+
+def run_jobs(jobs, shared=None, max_workers=None, force=False, cache_path=None):
+    """并行渲染所有任务，返回 {输出文件名: 耗时}
+
+    max_workers=1 时在当前进程内串行执行（便于调试）。
+    单个任务失败不会中断其他任务，失败信息会打印出来。
+    force=True 时忽略指纹缓存，全部重新渲染。
+    """
+    cache = BuildCache(cache_path) if cache_path else BuildCache()
+    keys = {}
+    pending = []
+    for job in jobs:
+        keys[job.name] = job_key(job, shared)
+        if force or not cache.is_fresh(job.name, keys[job.name]):
+            pending.append(job)
+    skipped = len(keys) - len(pending)
+    if skipped:
+        print(f"⏭  跳过 {skipped} 张输入未变化的图片")
+    jobs = pending
+    if not jobs:
+        return {}
+    max_workers = min(max_workers or default_workers(), len(jobs))
+    timings = {}
+    outputs = {}
+    start = time.perf_counter()
+
+    if max_workers == 1:
+        _init_worker(shared, tracing.is_enabled())
+        for job in jobs:
+            try:
+                timings[job.name], outputs[job.name] = _run_job(job)
+            except Exception as e:
+                print(f"  ⚠️  渲染失败 {job.name}: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_pool_worker,
+                                 initargs=(shared, tracing.is_enabled())) as pool:
+            futures = {pool.submit(_run_job_in_worker, job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    timings[job.name], outputs[job.name], events = future.result()
+                    tracing.extend(events)
+                except Exception as e:
+                    print(f"  ⚠️  渲染失败 {job.name}: {e}")
+
+    # 只记录渲染成功的输出，失败的下次会重试
+    for name in timings:
+        cache.record(name, keys[name], outputs[name])
+    cache.save()
+
+    report_timings(timings, time.perf_counter() - start, max_workers)
+    return timings
+
+
+def report_timings(timings, wall_time, workers):
+    """打印每张图的渲染耗时"""
+    print("\n⏱  渲染耗时")
+    for name, seconds in sorted(timings.items(), key=lambda kv: kv[1], reverse=True):
+        print(f"  {seconds:7.2f}s  {name}")
+    total = sum(timings.values())
+    print(f"  合计 {total:.2f}s（{len(timings)} 张），"
+          f"实际用时 {wall_time:.2f}s，进程数 {workers}")
@@ -0,0 +1,90 @@
+"""
+schema.py   —— 互动数据的紧凑类型定义
+-------------------------------------------------------------
+在读取数据后统一转换列类型，降低内存占用并加快分组计算：
+1. 账号、产品：category（重复值多，只存一份字典）
+2. 获赞数/评论数/分享数/收藏数：可空整数，按取值范围自动选最小位宽（UInt8/UInt16/UInt32…）
+3. 发布时间：datetime64
+
+注意：小位宽整数相加可能溢出，跨列求和前请先转成 Int64（见 widen）。
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# 互动计数列
+COUNT_COLUMNS = ['获赞数', '评论数', '分享数', '收藏数']
+CATEGORY_COLUMNS = ['账号', '产品']
+DATETIME_COLUMNS = ['发布时间']
+
+_UNSIGNED = ['UInt8', 'UInt16', 'UInt32', 'UInt64']
+_SIGNED = ['Int8', 'Int16', 'Int32', 'Int64']
+
+
+def downcast_count(series):
+    """计数列转换为能容纳其取值范围的最小可空整数类型；含小数时保留 float"""
+    values = pd.to_numeric(series, errors='coerce')
+    valid = values.dropna()
+    if len(valid) and not (valid == valid.round()).all():
+        return values.astype('float32')
+    if valid.empty:
+        return values.astype('UInt8')
+
+    low, high = valid.min(), valid.max()
+    candidates = _UNSIGNED if low >= 0 else _SIGNED
+    for dtype in candidates:
+        limits = np.iinfo(dtype.lower())
+        if limits.min <= low and high <= limits.max:
+            return values.astype(dtype)
+    return values.astype('Float64')
+
+
+def widen(series):
+    """计算前放宽位宽：整数 -> Int64，其他 -> float64"""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.astype('Int64')
+    return series.astype('float64')
+
+
+def apply_schema(df, categories=None):
+    """按统一类型转换数据表（返回新表，不修改原表）
+
+    categories 可指定 产品 列的类别顺序（默认按出现顺序）。
+    """
+    out = df.copy()
+    for col in COUNT_COLUMNS:
+        if col in out.columns:
+            out[col] = downcast_count(out[col])
+    for col in CATEGORY_COLUMNS:
+        if col in out.columns:
+            order = categories if col == '产品' and categories is not None \
+                else pd.unique(out[col].dropna())
+            out[col] = pd.Categorical(out[col], categories=order)
+    for col in DATETIME_COLUMNS:
+        if col in out.columns:
+            out[col] = pd.to_datetime(out[col], errors='coerce')
+    return out
+
+
+def memory_usage(df):
+    """数据表实际占用内存（字节，包含字符串内容）"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def memory_report(before, after):
+    """打印类型转换前后的内存占用对比"""
+    def size(n):
+        return f"{n / 1024 / 1024:.2f} MB" if n >= 1024 * 1024 else f"{n / 1024:.1f} KB"
+
+    total_before, total_after = memory_usage(before), memory_usage(after)
+    usage_before = before.memory_usage(deep=True)
+    usage_after = after.memory_usage(deep=True)
+
+    print("\n🧮 内存占用（类型转换前 → 后）")
+    for col in after.columns:
+        if col in usage_before:
+            print(f"  {col}\t{str(before[col].dtype):>14} → {str(after[col].dtype):<14}"
+                  f" {size(usage_before[col]):>10} → {size(usage_after[col]):>10}")
+    saved = 1 - total_after / total_before if total_before else 0
+    print(f"  合计 {size(total_before)} → {size(total_after)}（节省 {saved:.0%}）")
@@ -0,0 +1,90 @@
+"""
+synthetic_data.py   —— 合成“全平台Top20作品导出”数据
+-------------------------------------------------------------
+功能：
+1. 按指定行数生成与导出文件同结构的数据：标题/账号/发布时间/获赞数/评论数/分享数/收藏数
+2. 标题由中文词汇随机组合，部分作品为转载或轻微改写（用于测试去重）
+3. 账号按长尾分布发帖（少数账号贡献大部分作品），互动数为重尾分布（少数爆款）
+4. 发布时间分布在一个月内，带有午间和晚间的发布高峰
+
+全部用 NumPy 数组生成，百万行只需数秒；固定 seed 时结果可复现。
+"""
+
+import numpy as np
+import pandas as pd
+
+import ingest
+
+
+WORDS = [
+    '杨枝甘露', '奶皮子', '糖葫芦', '夏天', '必喝', '好喝', '冲泡', '一杯', '测评', '教程',
+    '网红', '自制', '甜品', '冰爽', '超级', '推荐', '早餐', '下午茶', '宝藏', '平替',
+    '低卡', '减脂', '芒果', '西柚', '椰奶', '酸甜', '浓郁', '零失败', '懒人', '打工人',
+    '开箱', '回购', '种草', '拔草', '真实', '分享', '小众', '国货', '神仙', '搭配',
+]
+SUFFIXES = ['', '', '', '！', '～', '！！', '😋', '（附做法）']
+
+# 发布时段权重（0~23时），午间和晚间是高峰
+HOUR_WEIGHTS = np.array([1, 1, 1, 1, 1, 1, 2, 3, 4, 4, 5, 6, 8, 7, 5, 5, 5, 6, 8, 10, 11, 10, 7, 3],
+                        dtype='float64')
+
+
+def make_export(n_rows, seed=0, start='2024-11-18', days=30, repost_rate=0.1):
+    """生成一个产品的导出数据（列与导出 Excel 相同，计数列为整数）"""
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS, dtype=object)
+
+    # 标题：3~6 个词 + 随机后缀
+    lengths = rng.integers(3, 7, n_rows)
+    picks = words[rng.integers(0, len(words), (n_rows, 6))]
+    titles = np.full(n_rows, '', dtype=object)
+    for k in range(6):
+        titles = np.where(lengths > k, titles + picks[:, k], titles)
+    titles = titles + np.array(SUFFIXES, dtype=object)[rng.integers(0, len(SUFFIXES), n_rows)]
+
+    # 转载/改写：复制较早一条作品的标题，只换后缀
+    reposts = rng.random(n_rows) < repost_rate
+    reposts[0] = False
+    source = (rng.random(n_rows) * np.arange(n_rows)).astype(np.int64)
+    base = np.array([t.rstrip('！～😋（附做法）') for t in titles[source]], dtype=object)
+    titles = np.where(reposts, base + np.array(SUFFIXES, dtype=object)[rng.integers(0, len(SUFFIXES), n_rows)],
+                      titles)
+
+    # 账号：Zipf 长尾（最活跃的账号约占两成作品）
+    n_accounts = max(1, n_rows // 5)
+    account_ids = np.minimum(rng.zipf(1.2, n_rows), n_accounts)
+    accounts = '用户' + pd.Series(account_ids).astype(str)
+
+    # 发布时间：日期均匀，时段按 HOUR_WEIGHTS
+    day = rng.integers(0, days, n_rows)
+    hour = rng.choice(24, n_rows, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    minute = rng.integers(0, 60, n_rows)
+    publish = pd.Timestamp(start) + pd.to_timedelta(day * 1440 + hour * 60 + minute, unit='min')
+
+    # 互动数：对数正态重尾，评论/分享/收藏与获赞相关
+    likes = np.floor(rng.lognormal(4.0, 1.8, n_rows))
+    comments = np.floor(likes * rng.beta(1, 12, n_rows))
+    shares = np.floor(likes * rng.beta(1, 8, n_rows))
+    favorites = np.floor(likes * rng.beta(2, 4, n_rows))
+
+    return pd.DataFrame({
+        '标题': titles,
+        '账号': accounts,
+        '发布时间': publish,
+        '获赞数': likes.astype('int64'),
+        '评论数': comments.astype('int64'),
+        '分享数': shares.astype('int64'),
+        '收藏数': favorites.astype('int64'),
+    })
+
+
+def make_exports(n_rows, products=('固体杨枝甘露', '奶皮子糖葫芦'), seed=0):
+    """生成多个产品的导出数据，返回 {产品: DataFrame}，总行数约为 n_rows"""
+    per_product = max(1, n_rows // len(products))
+    return {product: make_export(per_product, seed=seed + i) for i, product in enumerate(products)}
+
+
+def make_dataset(n_rows, products=('固体杨枝甘露', '奶皮子糖葫芦'), seed=0):
+    """生成统一列的合并数据（相当于 data_loader.read_exports 的结果）"""
+    return ingest.combine(ingest.from_export(df, product)
+                          for product, df in make_exports(n_rows, products, seed).items())
@@ -0,0 +1,154 @@
+"""
+table_render.py   —— 表格图片快速渲染（Pillow）
+-------------------------------------------------------------
+功能：
+1. 用 Pillow 直接绘制表格栅格图，不经过 matplotlib 的逐单元格样式设置
+2. 保留表头底色、斑马纹和单元格边框样式，列宽按内容自动计算
+3. 行数较多时自动分页，输出多张图片
+4. 同一次调用可同时输出 HTML / CSV
+
+分页文件名：第1页沿用原文件名，之后为 “文件名_2.png”、“文件名_3.png” ……
+"""
+
+import html
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+import fonts
+
+
+DEFAULT_COLORS = {
+    'header': '#5B9BA6',
+    'row_odd': '#E8F3F5',
+    'row_even': '#FFFFFF',
+    'text': '#333333',
+    'edge': '#CCCCCC',
+}
+
+ROWS_PER_PAGE = 30
+
+# 像素尺寸（约等于原 dpi=300 输出中的字号）
+FONT_SIZE = 36
+HEADER_FONT_SIZE = 40
+TITLE_FONT_SIZE = 64
+CELL_PADDING = 28
+ROW_HEIGHT = 80
+MARGIN = 48
+
+
+def _load_font(size):
+    path = fonts.find_cjk_font()
+    if path:
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size)
+
+
+def _page_paths(filename, pages):
+    path = Path(filename)
+    return [str(path)] + [str(path.with_name(f'{path.stem}_{i}{path.suffix}'))
+                          for i in range(2, pages + 1)]
+
+
+def _draw_page(header, rows, title, col_widths, colors, fonts_):
+    body_font, header_font, title_font = fonts_
+    table_width = sum(col_widths)
+    title_height = TITLE_FONT_SIZE + MARGIN if title else 0
+    width = table_width + 2 * MARGIN
+    height = title_height + ROW_HEIGHT * (len(rows) + 1) + 2 * MARGIN
+
+    img = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(img)
+
+    if title:
+        draw.text((width / 2, MARGIN), title, font=title_font, fill=colors['text'],
+                  anchor='mt', stroke_width=1, stroke_fill=colors['text'])
+
+    top = MARGIN + title_height
+    col_x = [MARGIN]
+    for w in col_widths:
+        col_x.append(col_x[-1] + w)
+
+    # 表头
+    draw.rectangle([MARGIN, top, MARGIN + table_width, top + ROW_HEIGHT],
+                   fill=colors['header'], outline=colors['edge'])
+    for j, text in enumerate(header):
+        draw.text(((col_x[j] + col_x[j + 1]) / 2, top + ROW_HEIGHT / 2), text,
+                  font=header_font, fill='white', anchor='mm',
+                  stroke_width=1, stroke_fill='white')
+
+    # 数据行：先整行填充斑马纹，再画文字
+    for i, row in enumerate(rows, start=1):
+        y = top + i * ROW_HEIGHT
+        fill = colors['row_odd'] if i % 2 == 0 else colors['row_even']
+        draw.rectangle([MARGIN, y, MARGIN + table_width, y + ROW_HEIGHT], fill=fill)
+        for j, text in enumerate(row):
+            draw.text(((col_x[j] + col_x[j + 1]) / 2, y + ROW_HEIGHT / 2), text,
+                      font=body_font, fill=colors['text'], anchor='mm')
+
+    # 边框：所有横线和竖线一次画完
+    bottom = top + ROW_HEIGHT * (len(rows) + 1)
+    for i in range(len(rows) + 2):
+        y = top + i * ROW_HEIGHT
+        draw.line([MARGIN, y, MARGIN + table_width, y], fill=colors['edge'], width=2)
+    for x in col_x:
+        draw.line([x, top, x, bottom], fill=colors['edge'], width=2)
+
+    return img
+
+
+def render_table(data, title, filename, colors=None, rows_per_page=ROWS_PER_PAGE,
+                 formats=('png',)):
+    """把 DataFrame 渲染为表格图片（可分页），并按需输出 HTML / CSV
+
+    返回写出的文件路径列表。
+    """
+    colors = {**DEFAULT_COLORS, **(colors or {})}
+    written = []
+    stem = Path(filename).with_suffix('')
+
+    if 'png' in formats:
+        header = [str(c) for c in data.columns]
+        cells = data.astype(object).where(data.notna(), '').astype(str).values.tolist()
+        fonts_ = (_load_font(FONT_SIZE), _load_font(HEADER_FONT_SIZE), _load_font(TITLE_FONT_SIZE))
+
+        # 列宽按整列最长文字计算，所有分页共用，保证各页版式一致
+        col_widths = []
+        for j, name in enumerate(header):
+            widest = max([fonts_[0].getlength(row[j]) for row in cells] +
+                         [fonts_[1].getlength(name)])
+            col_widths.append(int(widest) + 2 * CELL_PADDING)
+
+        pages = [cells[i:i + rows_per_page] for i in range(0, len(cells), rows_per_page)] or [[]]
+        for page_no, (rows, path) in enumerate(zip(pages, _page_paths(filename, len(pages))), 1):
+            page_title = title if len(pages) == 1 else f'{title}（{page_no}/{len(pages)}）'
+            _draw_page(header, rows, page_title, col_widths, colors, fonts_).save(path)
+            written.append(path)
+
+    if 'csv' in formats:
+        path = f'{stem}.csv'
+        data.to_csv(path, index=False, encoding='utf-8-sig')
+        written.append(path)
+
+    if 'html' in formats:
+        path = f'{stem}.html'
+        Path(path).write_text(_to_html(data, title, colors), encoding='utf-8')
+        written.append(path)
+
+    return written
+
+
+def _to_html(data, title, colors):
+    style = f"""<style>
+table {{ border-collapse: collapse; font-family: sans-serif; font-size: 14px; }}
+caption {{ font-size: 20px; font-weight: bold; padding: 12px; }}
+th {{ background: {colors['header']}; color: white; font-weight: bold; }}
+th, td {{ border: 1px solid {colors['edge']}; padding: 6px 14px; text-align: center; color: {colors['text']}; }}
+tbody tr:nth-child(odd) td {{ background: {colors['row_even']}; }}
+tbody tr:nth-child(even) td {{ background: {colors['row_odd']}; }}
+</style>"""
+    title = html.escape(title)
+    # 在 <table ...> 开始标签之后插入标题
+    table = data.to_html(index=False, border=0).replace('>', f'>\n<caption>{title}</caption>', 1)
+    return (f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{title}</title>\n'
+            f'{style}</head>\n<body>\n{table}\n</body></html>\n')
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from bootstrap import bootstrap_stats, resample_stats
+
+
+def naive_intervals(values, n_resamples, confidence=0.95, seed=1):
+    """逐次循环的 Bootstrap，作为对照"""
+    rng = np.random.default_rng(seed)
+    means, medians = [], []
+    for _ in range(n_resamples):
+        sample = rng.choice(values, len(values))
+        means.append(sample.mean())
+        medians.append(np.median(sample))
+    alpha = (1 - confidence) / 2
+    return np.quantile(means, [alpha, 1 - alpha]), np.quantile(medians, [alpha, 1 - alpha])
+
+
+def test_intervals_match_naive_loop():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        '产品': np.repeat(['A', 'B'], 20),
+        '点赞数': np.round(rng.lognormal(3, 1, 40)),
+    })
+    result = bootstrap_stats(df, '产品', ['点赞数'], n_resamples=20000)
+    for product in ['A', 'B']:
+        values = df.loc[df['产品'] == product, '点赞数'].to_numpy()
+        mean_ci, median_ci = naive_intervals(values, 20000)
+        spread = values.max() - values.min()
+        np.testing.assert_allclose(
+            [result['mean_low'].at[product, '点赞数'], result['mean_high'].at[product, '点赞数']],
+            mean_ci, atol=0.02 * spread)
+        np.testing.assert_allclose(
+            [result['median_low'].at[product, '点赞数'], result['median_high'].at[product, '点赞数']],
+            median_ci, atol=0.05 * spread)
+
+
+def test_value_path_matches_row_path():
+    # 取值大量重复时按取值抽样，与按行抽样的分布应一致
+    values = np.random.default_rng(2).integers(0, 5, 400).astype(float)
+    assert len(np.unique(values)) * 8 < len(values)
+    by_value = resample_stats(values, 20000, np.random.default_rng(3))
+    # 加极小的扰动使取值各不相同，强制走按行抽样
+    by_row = resample_stats(values + np.arange(len(values)) * 1e-12, 20000, np.random.default_rng(3))
+    for drawn_by_value, drawn_by_row in zip(by_value, by_row):
+        np.testing.assert_allclose(np.quantile(drawn_by_value, [0.025, 0.5, 0.975]),
+                                   np.quantile(drawn_by_row, [0.025, 0.5, 0.975]), atol=0.05)
+
+
+def test_missing_values_are_skipped():
+    df = pd.DataFrame({'产品': ['A', 'A', 'B'], '点赞数': [1.0, np.nan, np.nan], '评论数': [1.0, 2.0, 3.0]})
+    result = bootstrap_stats(df, '产品', ['点赞数', '评论数'], n_resamples=100)
+    assert result['mean_low'].at['A', '点赞数'] == result['mean_high'].at['A', '点赞数'] == 1
+    assert np.isnan(result['mean_low'].at['B', '点赞数'])
+    assert result['median_high'].at['B', '评论数'] == 3
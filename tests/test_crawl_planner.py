@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from crawl_planner import MIN_POSTS, estimate_seconds, plan_crawl, split_budget
+
+
+@pytest.mark.parametrize('total, weights', [
+    (300, [5, 3, 1, 1]),
+    (1000, [100, 1, 1]),
+    (30, [1, 2, 3]),
+    (10_000, [1, 1]),
+])
+def test_split_budget_sums_and_bounds(total, weights):
+    low, high = 20, 400
+    result = split_budget(total, weights, low, high)
+    assert result.sum() == min(total, high * len(weights))
+    assert result.max() <= high
+    assert result.min() >= min(low, total // len(weights))
+
+
+def test_split_budget_follows_weights():
+    result = split_budget(300, [5, 3, 1, 1], 20, 400)
+    assert list(result) == sorted(result, reverse=True)
+    assert np.all(result >= 20)
+
+
+def plan(tmp_path, keywords, **budget):
+    return plan_crawl(keywords, trend_file=tmp_path / 'trend.csv', status_file=tmp_path / 'status.json',
+                      **budget)
+
+
+@pytest.mark.parametrize('minutes', [0.3, 1, 3, 20])
+def test_plan_stays_within_minutes(tmp_path, minutes):
+    plans = plan(tmp_path, ['A', 'B', 'C', 'D'], total_minutes=minutes)
+    assert plans
+    assert sum(estimate_seconds(p.max_posts, p.scroll_times) for p in plans) <= minutes * 60
+
+
+def test_budget_below_one_keyword_plans_nothing(tmp_path):
+    assert plan(tmp_path, ['A', 'B'], total_minutes=0.2) == []
+    assert plan(tmp_path, ['A', 'B'], total_posts=0) == []
+
+
+def test_small_post_budget_keeps_one_keyword(tmp_path):
+    plans = plan(tmp_path, ['A', 'B'], total_posts=MIN_POSTS // 2)
+    assert [p.max_posts for p in plans] == [MIN_POSTS // 2]
@@ -0,0 +1,31 @@
+import pandas as pd
+
+from daemon import NOTE_VOLATILE_COLUMNS, merge_rows, note_key
+
+
+def notes(rows):
+    return pd.DataFrame(rows, columns=['笔记ID', '标题', '用户', '点赞数', '发布日期', '爬取时间'])
+
+
+def test_new_and_changed_rows_are_counted():
+    old = notes([['a1', 't1', 'u1', 10, '3天前', '08:00'], ['a2', 't2', 'u2', 5, '1天前', '08:00']])
+    new = notes([['a1', 't1', 'u1', 12, '4天前', '09:00'], ['a3', 't3', 'u3', 1, '刚刚', '09:00']])
+    merged, added, changed = merge_rows(old, new, note_key, ignore=NOTE_VOLATILE_COLUMNS)
+    assert (added, changed) == (1, 1)
+    assert sorted(merged['笔记ID']) == ['a1', 'a2', 'a3']
+    assert merged.loc[merged['笔记ID'] == 'a1', '点赞数'].item() == 12
+
+
+def test_volatile_columns_do_not_count_as_changes():
+    old = notes([['a1', 't1', 'u1', 10, '3天前', '08:00']])
+    new = notes([['a1', 't1', 'u1', '10', '4天前', '09:00']])
+    merged, added, changed = merge_rows(old, new, note_key, ignore=NOTE_VOLATILE_COLUMNS)
+    assert (added, changed) == (0, 0)
+    assert merged['发布日期'].tolist() == ['4天前']
+
+
+def test_duplicate_keys_keep_the_last_row():
+    new = notes([['note_1', 't1', 'u1', 1, '', ''], ['note_2', 't1', 'u1', 2, '', '']])
+    merged, added, changed = merge_rows(None, new, note_key)
+    assert (added, changed) == (1, 0)
+    assert merged['点赞数'].tolist() == [2]
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from dedup import near_duplicates, tokenize
+
+REPOST = '奶皮子糖葫芦 新疆 特产 零食 测评 推荐 好吃 酸甜 网红 打卡'
+EDITED = '奶皮子糖葫芦 新疆 特产 零食 测评 推荐 好吃 酸甜 网红 攻略'
+OTHER = '杨枝甘露 早餐 做法 教程 芒果 西柚 椰奶 夏天 甜品 简单'
+
+
+def test_reposts_and_light_edits_form_one_group():
+    titles = pd.Series([REPOST, OTHER, REPOST, EDITED])
+    result = near_duplicates(titles, priority=[1, 5, 3, 2])
+    assert result['重复组'].tolist() == [0, 1, 0, 0]
+    # 每组保留 priority 最高的一条
+    assert result['代表'].tolist() == [False, True, True, False]
+
+
+def test_half_overlapping_titles_stay_apart():
+    words = REPOST.split()
+    half = ' '.join(words[:5] + ['夜市', '小吃', '排队', '老板', '手工'])
+    assert set(tokenize(REPOST)) & set(tokenize(half))
+    result = near_duplicates(pd.Series([REPOST, half]))
+    assert result['代表'].all()
+
+
+def test_groups_are_checked_separately():
+    titles = pd.Series([REPOST, REPOST, REPOST], index=[10, 11, 12])
+    result = near_duplicates(titles, groups=['A', 'B', 'A'])
+    assert result.index.tolist() == [10, 11, 12]
+    assert result['重复组'].tolist() == [0, 1, 0]
+    assert result['代表'].tolist() == [True, True, False]
+
+
+def test_empty_titles_are_their_own_representatives():
+    result = near_duplicates(pd.Series([None, '', None]))
+    assert result['代表'].all()
+    assert result['重复组'].tolist() == [0, 1, 2]
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from quantile_sketch import KLLSketch, box_stats, daily_sketches, merge_days, update_sketches
+
+
+def rank_error(sketch, values, qs):
+    ordered = np.sort(values)
+    estimates = sketch.quantiles(qs)
+    ranks = np.searchsorted(ordered, estimates, side='right') / len(ordered)
+    return np.abs(ranks - qs).max()
+
+
+def test_small_input_is_exact():
+    values = np.random.default_rng(1).lognormal(3, 1.5, 150)
+    sketch = KLLSketch().update(values)
+    qs = [0.1, 0.25, 0.5, 0.75, 0.9]
+    np.testing.assert_allclose(sketch.quantiles(qs), np.quantile(values, qs))
+
+
+def test_merged_chunks_rank_error():
+    rng = np.random.default_rng(0)
+    chunks = [rng.lognormal(3, 1.5, 20_000) for _ in range(30)]
+    sketch = KLLSketch()
+    for chunk in chunks:
+        sketch.merge(KLLSketch().update(chunk))
+    assert sketch.n == 600_000
+    # 文档中的秩误差约为 1.7/k（k=200 时约 1%）
+    assert rank_error(sketch, np.concatenate(chunks), np.linspace(0.01, 0.99, 99)) < 1.7 / sketch.k
+
+
+def test_dict_round_trip():
+    sketch = KLLSketch().update(np.random.default_rng(2).normal(size=5000))
+    restored = KLLSketch.from_dict(sketch.to_dict())
+    qs = [0.05, 0.5, 0.95]
+    np.testing.assert_array_equal(restored.quantiles(qs), sketch.quantiles(qs))
+    assert restored.n == sketch.n
+
+
+def test_box_stats_matches_exact_quartiles():
+    values = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 100], dtype=float)
+    stats = box_stats(KLLSketch().update(values))
+    assert (stats['q1'], stats['med'], stats['q3']) == tuple(np.quantile(values, [0.25, 0.5, 0.75]))
+    assert stats['whishi'] == 9
+    assert list(stats['fliers']) == [100]
+
+
+def test_fresh_days_replace_cached_days():
+    def frame(likes):
+        return pd.DataFrame({
+            '产品': ['A'] * len(likes),
+            '发布时间': pd.to_datetime(['2024-05-01'] * (len(likes) - 1) + ['2024-05-02']),
+            '点赞数': likes,
+        })
+
+    cached = daily_sketches(frame([1.0, 2.0, 3.0]), ['点赞数'])
+    fresh = daily_sketches(frame([10.0, 20.0])[:1], ['点赞数'])
+    merged = merge_days(update_sketches(cached, fresh))[('A', '点赞数')]
+    # 5月1日被新数据替换，5月2日沿用缓存
+    assert merged.n == 2
+    assert merged.min == 3 and merged.max == 10
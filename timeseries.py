@@ -0,0 +1,101 @@
+"""
+timeseries.py   —— 发布时间分析（向量化）
+-------------------------------------------------------------
+功能：
+1. 所有产品一次分组，得到按天/按小时的发布数量，时间轴补齐为连续区间（缺的日期记0）
+2. 产品 × 星期 × 小时 的发布数量矩阵，用于“星期-时段”热力图
+3. 统计结果可以保存下来，每日更新时只需用新数据覆盖其涉及的 (日期, 产品)，其他产品的记录不受影响
+
+所有计算都基于分类编码和 np.bincount，数据量到百万级也只需一次遍历。
+"""
+
+import numpy as np
+import pandas as pd
+
+
+WEEKDAYS = ['周一', '周二', '周三', '周四', '周五', '周六', '周日']
+HOURS = list(range(24))
+
+
+def _product_codes(df):
+    """产品列的整数编码和对应的产品名（按出现顺序）"""
+    products = df['产品']
+    if isinstance(products.dtype, pd.CategoricalDtype):
+        names = [p for p in pd.unique(products) if pd.notna(p)]
+        codes = pd.Categorical(products, categories=names).codes
+    else:
+        codes, names = pd.factorize(products)
+        names = list(names)
+    return np.asarray(codes, dtype=np.int64), names
+
+
+def publish_counts(df, freq='D'):
+    """各产品按 freq（'D' 按天，'h' 按小时）统计的发布数量
+
+    返回 DataFrame：行为连续的时间点（缺失的时间记0），列为产品。
+    """
+    times = pd.to_datetime(df['发布时间'], errors='coerce')
+    codes, names = _product_codes(df)
+    valid = times.notna().to_numpy() & (codes >= 0)
+    if not valid.any():
+        return pd.DataFrame(columns=names, dtype='int64')
+
+    buckets = times[valid].dt.floor(freq)
+    start = buckets.min()
+    step = pd.to_timedelta(pd.tseries.frequencies.to_offset(freq).nanos, unit="ns")
+    offsets = ((buckets - start) // step).to_numpy()
+    n_buckets = int(offsets.max()) + 1
+
+    slot = codes[valid] * n_buckets + offsets
+    counts = np.bincount(slot, minlength=len(names) * n_buckets).reshape(len(names), n_buckets)
+
+    index = pd.date_range(start, periods=n_buckets, freq=freq, name='发布时间')
+    return pd.DataFrame(counts.T, index=index, columns=names)
+
+
+def hour_weekday_matrix(df):
+    """产品 × 星期 × 小时 的发布数量
+
+    返回 DataFrame：行索引为 (产品, 星期)，列为 0~23 时，每个产品固定7行。
+    """
+    times = pd.to_datetime(df['发布时间'], errors='coerce')
+    codes, names = _product_codes(df)
+    valid = times.notna().to_numpy() & (codes >= 0)
+
+    slot = (codes[valid] * 7 + times[valid].dt.dayofweek.to_numpy()) * 24 \
+        + times[valid].dt.hour.to_numpy()
+    counts = np.bincount(slot, minlength=len(names) * 7 * 24).reshape(len(names) * 7, 24)
+
+    index = pd.MultiIndex.from_product([names, WEEKDAYS], names=['产品', '星期'])
+    return pd.DataFrame(counts, index=index, columns=HOURS)
+
+
+def update_counts(cached, fresh, freq='D'):
+    """用新统计结果更新缓存：fresh 中的 (时间点, 产品) 以 fresh 为准，其余沿用 cached
+
+    适合每日增量更新——只需对当天（或最近几天）的数据调用 publish_counts；
+    fresh 中没有的产品在这些日期上的记录保持不变。
+    """
+    if cached is None or cached.empty:
+        return fresh
+    if fresh.empty:
+        return cached
+    columns = list(cached.columns) + [c for c in fresh.columns if c not in cached.columns]
+    merged = fresh.combine_first(cached).reindex(columns=columns)
+    merged = merged.fillna(0).astype('int64').sort_index()
+    # 补齐合并后可能出现的时间空档
+    full_index = pd.date_range(merged.index.min(), merged.index.max(), freq=freq, name='发布时间')
+    return merged.reindex(full_index, fill_value=0)
+
+
+def save_counts(counts, path):
+    """保存统计结果（CSV，首列为时间）"""
+    counts.to_csv(path, encoding='utf-8-sig')
+
+
+def load_counts(path):
+    """读取 save_counts 保存的统计结果，文件不存在时返回 None"""
+    try:
+        return pd.read_csv(path, index_col=0, parse_dates=True, encoding='utf-8-sig')
+    except FileNotFoundError:
+        return None
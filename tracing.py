@@ -0,0 +1,140 @@
+"""
+tracing.py   —— 阶段耗时追踪
+-------------------------------------------------------------
+功能：
+1. span 上下文管理器 / traced 装饰器，记录爬取、分词、出图等各阶段的开始时间和耗时
+2. 导出为 Chrome Trace 格式的 JSON（chrome://tracing 或 https://ui.perfetto.dev 打开）
+3. 运行结束时打印按阶段汇总的次数、总耗时、平均和最长耗时
+
+未启用时 span 直接返回空的上下文管理器，几乎没有额外开销。
+渲染子进程中的记录会随任务结果传回主进程（见 render_pool.py）。
+
+使用示例：
+    tracing.enable()
+    with tracing.span('滚动加载', keyword=keyword):
+        ...
+    tracing.write_trace('trace.json')
+    tracing.report()
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+
+TRACE_FILE = 'trace.json'
+
+_enabled = False
+_events = []
+_lock = threading.Lock()
+_NULL = nullcontext()
+
+
+def enable():
+    """开始记录（之前的记录保留）"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+@contextmanager
+def _record(name, category, args):
+    start_wall = time.time()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        event = {
+            'name': name, 'cat': category, 'ph': 'X',
+            'ts': start_wall * 1e6, 'dur': (time.perf_counter() - start) * 1e6,
+            'pid': os.getpid(), 'tid': threading.get_ident(),
+        }
+        if args:
+            event['args'] = {k: str(v) for k, v in args.items()}
+        with _lock:
+            _events.append(event)
+
+
+def span(name, category='stage', **args):
+    """记录一个阶段：with tracing.span('分词', product=p): ...
+
+    args 会写入 trace 的 args 字段（如关键词、第几次滚动），不影响汇总时的分组。
+    """
+    if not _enabled:
+        return _NULL
+    return _record(name, category, args)
+
+
+def traced(name=None, category='stage'):
+    """装饰器版本的 span，默认以函数名作为阶段名"""
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _record(label, category, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def collect():
+    """取出并清空当前进程的记录（子进程把它随结果传回主进程）"""
+    with _lock:
+        events = list(_events)
+        _events.clear()
+    return events
+
+
+def extend(events):
+    """并入其他进程的记录"""
+    with _lock:
+        _events.extend(events)
+
+
+def events():
+    with _lock:
+        return list(_events)
+
+
+def write_trace(path=TRACE_FILE):
+    """导出 Chrome Trace 格式的 JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events(), 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+    print(f"✓ 阶段耗时记录已保存: {path}")
+
+
+def summarize():
+    """按阶段名汇总：{阶段: (次数, 总耗时秒, 最长耗时秒)}，按总耗时降序"""
+    totals = {}
+    for event in events():
+        count, total, longest = totals.get(event['name'], (0, 0.0, 0.0))
+        seconds = event['dur'] / 1e6
+        totals[event['name']] = (count + 1, total + seconds, max(longest, seconds))
+    return dict(sorted(totals.items(), key=lambda kv: kv[1][1], reverse=True))
+
+
+def report(top_n=30):
+    """打印各阶段的次数和耗时"""
+    totals = summarize()
+    if not totals:
+        return
+    print("\n⏱  阶段耗时汇总")
+    print(f"  {'阶段':<24}{'次数':>6}{'总耗时':>10}{'平均':>10}{'最长':>10}")
+    for name, (count, total, longest) in list(totals.items())[:top_n]:
+        print(f"  {name:<24}{count:>6}{total:>9.2f}s{total / count:>9.3f}s{longest:>9.2f}s")
+    if len(totals) > top_n:
+        print(f"  …… 其余 {len(totals) - top_n} 个阶段见 trace 文件")
@@ -2,13 +2,15 @@
 xiaohongshu_spider.py   —— 多关键词小红书笔记爬虫（Selenium版）
 -------------------------------------------------------------
 功能：
-1. 关键词列表从 keywords.txt 读取（每行一个关键词）
+1. 关键词列表从 keywords.txt 读取（每行一个关键词，可附监测间隔）
 2. 每个关键词的笔记写入 Excel 独立 Sheet
 3. 使用Selenium模拟真实浏览器，绕过API限制
 4. 支持自动滚动加载更多内容
+5. 可按新榜热度分配各关键词的笔记数和爬取顺序（见 crawl_planner.py）
+6. 浏览器每爬若干关键词或内存超限时自动重启，崩溃后重启并重试当前关键词（见 ManagedDriver）
 
 使用说明：
-1. 需要安装：pip install selenium pandas openpyxl
+1. 需要安装：pip install selenium pandas openpyxl（可选 psutil，用于检查浏览器内存）
 2. 需要下载ChromeDriver并配置路径
 3. 运行前需要手动登录小红书（会自动打开浏览器）
 
@@ -24,16 +26,62 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (TimeoutException, NoSuchElementException,
+                                        InvalidSessionIdException, WebDriverException)
 
+import tracing
 
-with open("keywords.txt", "r", encoding="utf-8") as f:
-    KEYWORD_LIST = [line.strip() for line in f if line.strip()]
 
+KEYWORDS_FILE = "keywords.txt"
+OUTPUT_FILE = "xiaohongshu_data.xlsx"
 MAX_POSTS = 100          # 每个关键词抓取笔记数量
 SCROLL_TIMES = 15        # 页面滚动次数（每次滚动加载更多）
 CHROMEDRIVER_PATH = "path/to/chromedriver"  # ChromeDriver路径，改为你的实际路径
 
+# 浏览器回收（见 ManagedDriver）
+RECYCLE_PAGES = 10       # 每个浏览器最多打开的搜索页数（关键词数），之后重启
+MAX_DRIVER_MB = 1500     # 浏览器（chromedriver 及全部 Chrome 子进程）内存上限，超过后重启；需要 psutil
+CRASH_RETRIES = 1        # 浏览器崩溃后当前关键词的重试次数
+
+# 出现这些信息说明标签页崩溃或会话已失效，只能重启浏览器
+CRASH_MESSAGES = ("tab crashed", "session deleted", "disconnected", "no such window",
+                  "chrome not reachable", "invalid session id")
+
+
+# 监测间隔单位（见 load_keyword_schedule）
+INTERVAL_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def parse_interval(text):
+    """'30m' / '6h' / '1d' -> 秒，无法识别时返回 None"""
+    unit = INTERVAL_UNITS.get(text[-1:].lower())
+    try:
+        return float(text[:-1]) * unit if unit else None
+    except ValueError:
+        return None
+
+
+def load_keyword_schedule(path=KEYWORDS_FILE):
+    """读取关键词及可选的监测间隔，返回 {关键词: 间隔秒数或None}
+
+    每行一个关键词，后面可以用空格隔开写监测间隔，如 “奶皮子糖葫芦 6h”（见 daemon.py）。
+    """
+    schedule = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            interval = parse_interval(parts[-1]) if len(parts) > 1 else None
+            keyword = " ".join(parts[:-1]) if interval else line.strip()
+            schedule[keyword] = interval
+    return schedule
+
+
+def load_keywords(path=KEYWORDS_FILE):
+    """从关键词文件读取关键词列表（每行一个，忽略监测间隔）"""
+    return list(load_keyword_schedule(path))
+
 
 def init_driver():
     """初始化Chrome浏览器"""
@@ -98,12 +146,167 @@ def login_xiaohongshu(driver):
 def scroll_to_load_more(driver, times=5):
     """滚动页面以加载更多内容"""
     for i in range(times):
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(random.uniform(2, 3))
+        with tracing.span('滚动加载', scroll=i + 1):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(random.uniform(2, 3))
         print(f"  📜 滚动 {i+1}/{times}")
 
 
-def crawl_keyword(driver, keyword: str, max_posts: int) -> pd.DataFrame:
+def extract_note(elem, idx):
+    """从一个笔记卡片元素中提取数据，没有标题时返回 None"""
+    # 提取笔记链接 - 优先从元素本身获取，否则查找子元素中的a标签
+    link = elem.get_attribute("href") or ""
+    
+    # 如果元素本身没有href，尝试在内部查找a标签
+    if not link:
+        try:
+            link_elem = elem.find_element(By.CSS_SELECTOR, "a")
+            link = link_elem.get_attribute("href") or ""
+        except NoSuchElementException:
+            pass
+    
+    # 调试输出
+    if idx < 3:  # 只输出前3个元素的调试信息
+        print(f"  [调试] 元素{idx+1} link: {link[:80] if link else '无链接'}")
+    
+    # 如果找到链接且包含关键路径，提取note_id
+    note_id = ""
+    if link and ("/explore/" in link or "/discovery/item/" in link):
+        note_id = link.split("/")[-1].split("?")[0]
+    else:
+        # 如果没有有效链接，仍然尝试提取其他信息
+        note_id = f"note_{idx+1}"
+    
+    # 尝试提取标题
+    title = ""
+    try:
+        # 尝试多个可能的标题选择器
+        title_selectors = [".title", ".note-title", "span.title", ".footer .title"]
+        for sel in title_selectors:
+            try:
+                title_elem = elem.find_element(By.CSS_SELECTOR, sel)
+                title = title_elem.text.strip()
+                if title:
+                    break
+            except NoSuchElementException:
+                continue
+        
+        # 如果还是没有标题，获取整个元素的文本
+        if not title:
+            title = elem.text.strip()[:100]  # 取前100字符
+            
+    except Exception:
+        title = f"笔记_{idx+1}"
+    
+    # 尝试提取作者
+    user = ""
+    try:
+        user_selectors = [".author", ".username", ".name", ".author-wrapper .name"]
+        for sel in user_selectors:
+            try:
+                user_elem = elem.find_element(By.CSS_SELECTOR, sel)
+                user = user_elem.text.strip()
+                if user:
+                    break
+            except NoSuchElementException:
+                continue
+    except Exception:
+        user = "未知"
+    
+    # 尝试提取点赞数
+    likes = 0
+    try:
+        like_selectors = [".like-count", ".likes", ".interaction .count", "span[class*='like']", ".footer-container .count"]
+        for sel in like_selectors:
+            try:
+                like_elem = elem.find_element(By.CSS_SELECTOR, sel)
+                likes_text = like_elem.text.strip()
+                # 处理可能的k、w等单位
+                if 'w' in likes_text:
+                    likes = int(float(''.join(filter(lambda x: x.isdigit() or x == '.', likes_text))) * 10000)
+                elif 'k' in likes_text.lower():
+                    likes = int(float(''.join(filter(lambda x: x.isdigit() or x == '.', likes_text))) * 1000)
+                else:
+                    likes = int(''.join(filter(str.isdigit, likes_text))) if likes_text else 0
+                if likes > 0:
+                    break
+            except (NoSuchElementException, ValueError):
+                continue
+    except Exception:
+        likes = 0
+    
+    # 尝试提取评论数
+    comments = 0
+    try:
+        comment_selectors = [".comment-count", ".comments", "span[class*='comment']", ".footer-container .comment"]
+        for sel in comment_selectors:
+            try:
+                comment_elem = elem.find_element(By.CSS_SELECTOR, sel)
+                comments_text = comment_elem.text.strip()
+                # 处理可能的k、w等单位
+                if 'w' in comments_text:
+                    comments = int(float(''.join(filter(lambda x: x.isdigit() or x == '.', comments_text))) * 10000)
+                elif 'k' in comments_text.lower():
+                    comments = int(float(''.join(filter(lambda x: x.isdigit() or x == '.', comments_text))) * 1000)
+                else:
+                    comments = int(''.join(filter(str.isdigit, comments_text))) if comments_text else 0
+                if comments > 0:
+                    break
+            except (NoSuchElementException, ValueError):
+                continue
+    except Exception:
+        comments = 0
+    
+    # 尝试提取发布日期
+    publish_date = ""
+    try:
+        date_selectors = [".publish-date", ".date", "span[class*='time']", ".footer-container .time"]
+        for sel in date_selectors:
+            try:
+                date_elem = elem.find_element(By.CSS_SELECTOR, sel)
+                publish_date = date_elem.text.strip()
+                if publish_date:
+                    break
+            except NoSuchElementException:
+                continue
+    except Exception:
+        publish_date = "未知"
+    
+    # 尝试提取词条/标签
+    tags = ""
+    try:
+        tag_selectors = [".tag", ".tags", "[class*='tag']", ".footer-container .tag"]
+        tag_elements = []
+        for sel in tag_selectors:
+            try:
+                tag_elements = elem.find_elements(By.CSS_SELECTOR, sel)
+                if tag_elements:
+                    break
+            except NoSuchElementException:
+                continue
+        
+        if tag_elements:
+            tags = ", ".join([tag.text.strip() for tag in tag_elements[:5] if tag.text.strip()])  # 最多取5个标签
+    except Exception:
+        tags = ""
+    
+    # 只要有标题就保存数据（不再强制要求link包含explore）
+    if title and title != f"笔记_{idx+1}":
+        return {
+            "笔记ID": note_id,
+            "标题": title,
+            "用户": user if user else "未知",
+            "发布日期": publish_date if publish_date else "未知",
+            "点赞数": likes,
+            "评论数": comments,
+            "词条/标签": tags if tags else "无",
+            "链接": link if link else "无",
+        }
+    return None
+
+
+@tracing.traced('爬取关键词')
+def crawl_keyword(driver, keyword: str, max_posts: int, scroll_times: int = SCROLL_TIMES) -> pd.DataFrame:
     """爬取指定关键词的笔记"""
     rows = []
     
@@ -111,11 +314,12 @@ def crawl_keyword(driver, keyword: str, max_posts: int) -> pd.DataFrame:
     search_url = f"https://www.xiaohongshu.com/search_result?keyword={keyword}&source=web_search_result_notes"
     
     print(f"\n正在爬取关键词: '{keyword}'")
-    driver.get(search_url)
-    time.sleep(3)
+    with tracing.span('打开搜索页', keyword=keyword):
+        driver.get(search_url)
+        time.sleep(3)
     
     # 滚动加载更多
-    scroll_to_load_more(driver, SCROLL_TIMES)
+    scroll_to_load_more(driver, scroll_times)
     
     try:
         # 等待笔记列表加载
@@ -145,159 +349,18 @@ def crawl_keyword(driver, keyword: str, max_posts: int) -> pd.DataFrame:
         print(f"  ✗ 未找到任何笔记元素")
         return pd.DataFrame()
     
-    # 提取数据
+    # 提取数据（记录爬取时间，'3天前'、'昨天 12:30' 等相对时间以它为基准换算）
+    crawled_at = time.strftime('%Y-%m-%d %H:%M:%S')
     for idx, elem in enumerate(note_elements[:max_posts]):
         try:
-            # 提取笔记链接 - 优先从元素本身获取，否则查找子元素中的a标签
-            link = elem.get_attribute("href") or ""
-            
-            # 如果元素本身没有href，尝试在内部查找a标签
-            if not link:
-                try:
-                    link_elem = elem.find_element(By.CSS_SELECTOR, "a")
-                    link = link_elem.get_attribute("href") or ""
-                except NoSuchElementException:
-                    pass
-            
-            # 调试输出
-            if idx < 3:  # 只输出前3个元素的调试信息
-                print(f"  [调试] 元素{idx+1} link: {link[:80] if link else '无链接'}")
-            
-            # 如果找到链接且包含关键路径，提取note_id
-            note_id = ""
-            if link and ("/explore/" in link or "/discovery/item/" in link):
-                note_id = link.split("/")[-1].split("?")[0]
-            else:
-                # 如果没有有效链接，仍然尝试提取其他信息
-                note_id = f"note_{idx+1}"
-            
-            # 尝试提取标题
-            title = ""
-            try:
-                # 尝试多个可能的标题选择器
-                title_selectors = [".title", ".note-title", "span.title", ".footer .title"]
-                for sel in title_selectors:
-                    try:
-                        title_elem = elem.find_element(By.CSS_SELECTOR, sel)
-                        title = title_elem.text.strip()
-                        if title:
-                            break
-                    except NoSuchElementException:
-                        continue
-                
-                # 如果还是没有标题，获取整个元素的文本
-                if not title:
-                    title = elem.text.strip()[:100]  # 取前100字符
-                    
-            except Exception:
-                title = f"笔记_{idx+1}"
-            
-            # 尝试提取作者
-            user = ""
-            try:
-                user_selectors = [".author", ".username", ".name", ".author-wrapper .name"]
-                for sel in user_selectors:
-                    try:
-                        user_elem = elem.find_element(By.CSS_SELECTOR, sel)
-                        user = user_elem.text.strip()
-                        if user:
-                            break
-                    except NoSuchElementException:
-                        continue
-            except Exception:
-                user = "未知"
-            
-            # 尝试提取点赞数
-            likes = 0
-            try:
-                like_selectors = [".like-count", ".likes", ".interaction .count", "span[class*='like']", ".footer-container .count"]
-                for sel in like_selectors:
-                    try:
-                        like_elem = elem.find_element(By.CSS_SELECTOR, sel)
-                        likes_text = like_elem.text.strip()
-                        # 处理可能的k、w等单位
-                        if 'w' in likes_text:
-                            likes = int(float(''.join(filter(lambda x: x.isdigit() or x == '.', likes_text))) * 10000)
-                        elif 'k' in likes_text.lower():
-                            likes = int(float(''.join(filter(lambda x: x.isdigit() or x == '.', likes_text))) * 1000)
-                        else:
-                            likes = int(''.join(filter(str.isdigit, likes_text))) if likes_text else 0
-                        if likes > 0:
-                            break
-                    except (NoSuchElementException, ValueError):
-                        continue
-            except Exception:
-                likes = 0
-            
-            # 尝试提取评论数
-            comments = 0
-            try:
-                comment_selectors = [".comment-count", ".comments", "span[class*='comment']", ".footer-container .comment"]
-                for sel in comment_selectors:
-                    try:
-                        comment_elem = elem.find_element(By.CSS_SELECTOR, sel)
-                        comments_text = comment_elem.text.strip()
-                        # 处理可能的k、w等单位
-                        if 'w' in comments_text:
-                            comments = int(float(''.join(filter(lambda x: x.isdigit() or x == '.', comments_text))) * 10000)
-                        elif 'k' in comments_text.lower():
-                            comments = int(float(''.join(filter(lambda x: x.isdigit() or x == '.', comments_text))) * 1000)
-                        else:
-                            comments = int(''.join(filter(str.isdigit, comments_text))) if comments_text else 0
-                        if comments > 0:
-                            break
-                    except (NoSuchElementException, ValueError):
-                        continue
-            except Exception:
-                comments = 0
-            
-            # 尝试提取发布日期
-            publish_date = ""
-            try:
-                date_selectors = [".publish-date", ".date", "span[class*='time']", ".footer-container .time"]
-                for sel in date_selectors:
-                    try:
-                        date_elem = elem.find_element(By.CSS_SELECTOR, sel)
-                        publish_date = date_elem.text.strip()
-                        if publish_date:
-                            break
-                    except NoSuchElementException:
-                        continue
-            except Exception:
-                publish_date = "未知"
-            
-            # 尝试提取词条/标签
-            tags = ""
-            try:
-                tag_selectors = [".tag", ".tags", "[class*='tag']", ".footer-container .tag"]
-                tag_elements = []
-                for sel in tag_selectors:
-                    try:
-                        tag_elements = elem.find_elements(By.CSS_SELECTOR, sel)
-                        if tag_elements:
-                            break
-                    except NoSuchElementException:
-                        continue
-                
-                if tag_elements:
-                    tags = ", ".join([tag.text.strip() for tag in tag_elements[:5] if tag.text.strip()])  # 最多取5个标签
-            except Exception:
-                tags = ""
-            
-            # 只要有标题就保存数据（不再强制要求link包含explore）
-            if title and title != f"笔记_{idx+1}":
-                rows.append({
-                    "笔记ID": note_id,
-                    "标题": title,
-                    "用户": user if user else "未知",
-                    "发布日期": publish_date if publish_date else "未知",
-                    "点赞数": likes,
-                    "评论数": comments,
-                    "词条/标签": tags if tags else "无",
-                    "链接": link if link else "无",
-                })
-            
+            with tracing.span('提取笔记', keyword=keyword):
+                row = extract_note(elem, idx)
+            if row:
+                row['爬取时间'] = crawled_at
+                rows.append(row)
         except Exception as e:
+            if driver_crashed(e):
+                raise  # 浏览器已崩溃，后面的笔记也无法提取，交给 ManagedDriver 重启后重试
             print(f"  ⚠️  提取第 {idx+1} 个笔记数据失败: {e}")
             continue
     
@@ -305,44 +368,222 @@ def crawl_keyword(driver, keyword: str, max_posts: int) -> pd.DataFrame:
     return pd.DataFrame(rows)
 
 
-def main():
+def driver_crashed(error):
+    """浏览器或标签页崩溃、会话失效时返回 True（普通的元素查找失败返回 False）"""
+    if isinstance(error, InvalidSessionIdException):
+        return True
+    message = str(error).lower()
+    return isinstance(error, WebDriverException) and any(m in message for m in CRASH_MESSAGES)
+
+
+def browser_memory_mb(driver):
+    """chromedriver 及其全部子进程（Chrome 各进程）的内存占用（MB）
+
+    未安装 psutil 或无法获取进程信息时返回 None。
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+    total = 0
+    for proc in processes:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue  # 统计过程中退出的子进程
+    return total / 1024 / 1024
+
+
+class ManagedDriver:
+    """浏览器生命周期管理
+
+    1. 记录当前浏览器打开的搜索页数和内存占用
+    2. 超过 RECYCLE_PAGES 页或 MAX_DRIVER_MB 时，在两个关键词之间重启浏览器
+    3. 标签页崩溃或会话失效时立即重启，并重试当前关键词；
+       重试后仍崩溃时关闭浏览器并抛出异常，下一个关键词开始前重新启动
+    重启后用保存的 Cookie 恢复登录状态，只有第一次启动需要手动登录。
+    """
+
+    def __init__(self, max_pages=RECYCLE_PAGES, max_memory_mb=MAX_DRIVER_MB):
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.driver = None
+        self.cookies = []
+        self.pages = 0
+        self.restarts = 0
+
+    def start(self):
+        """启动浏览器：首次手动登录，之后用 Cookie 恢复登录状态"""
+        self.driver = init_driver()
+        self.pages = 0
+        if self.cookies:
+            self.restore_session()
+        else:
+            login_xiaohongshu(self.driver)
+            self.save_session()
+        if self.max_memory_mb and browser_memory_mb(self.driver) is None:
+            print("  ⚠️  无法获取浏览器内存（需要 pip install psutil），只按页数重启")
+
+    def save_session(self):
+        try:
+            self.cookies = self.driver.get_cookies()
+        except WebDriverException:
+            pass  # 浏览器已崩溃时沿用上次保存的 Cookie
+
+    def restore_session(self):
+        self.driver.get("https://www.xiaohongshu.com/")
+        for cookie in self.cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except WebDriverException:
+                continue
+        self.driver.refresh()
+
+    def quit(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass  # 已崩溃的浏览器可能无法正常退出
+            self.driver = None
+
+    def restart(self, reason):
+        with tracing.span('重启浏览器', reason=reason):
+            print(f"  🔁 重启浏览器：{reason}")
+            self.save_session()
+            self.quit()
+            self.start()
+        self.restarts += 1
+
+    def recycle_reason(self):
+        """需要回收当前浏览器时返回原因，否则返回 None"""
+        if self.max_pages and self.pages >= self.max_pages:
+            return f"已打开 {self.pages} 个搜索页"
+        memory = browser_memory_mb(self.driver) if self.max_memory_mb else None
+        if memory is not None and memory > self.max_memory_mb:
+            return f"内存占用 {memory:.0f}MB 超过 {self.max_memory_mb}MB"
+        return None
+
+    def crawl(self, keyword, max_posts=MAX_POSTS, scroll_times=SCROLL_TIMES):
+        """爬取一个关键词；必要时先回收浏览器，崩溃时重启并重试"""
+        if self.driver is None:
+            self.start()
+        reason = self.recycle_reason()
+        if reason:
+            self.restart(reason)
+        for attempt in range(CRASH_RETRIES + 1):
+            try:
+                df = crawl_keyword(self.driver, keyword, max_posts, scroll_times)
+            except WebDriverException as e:
+                if not driver_crashed(e):
+                    raise
+                if attempt == CRASH_RETRIES:
+                    # 放弃当前关键词；已崩溃的浏览器不再使用，下次 crawl 时重新启动
+                    self.quit()
+                    raise
+                self.restart(f"浏览器崩溃（{str(e).splitlines()[0][:60]}），重试 '{keyword}'")
+                continue
+            self.pages += 1
+            self.save_session()
+            return df
+
+
+def crawl_keywords(session, keywords, plans=None):
+    """逐个爬取关键词，每爬完一个就返回 (关键词, DataFrame)，无数据的关键词跳过
+
+    session 为 ManagedDriver，负责浏览器的定期回收和崩溃重启。
+    plans 为 {关键词: CrawlPlan}（见 crawl_planner.py）时按计划的笔记数和滚动次数爬取。
+    某个关键词重试 CRASH_RETRIES 次后浏览器仍然崩溃时，跳过该关键词，用新的浏览器继续下一个。
+    """
+    for keyword in keywords:
+        plan = (plans or {}).get(keyword)
+        try:
+            if plan:
+                df = session.crawl(keyword, plan.max_posts, plan.scroll_times)
+            else:
+                df = session.crawl(keyword)
+        except WebDriverException as e:
+            if not driver_crashed(e):
+                raise
+            print(f"  ❌ 关键词 '{keyword}' 爬取失败（浏览器重试后仍崩溃），跳过: {str(e).splitlines()[0][:60]}")
+            continue
+        
+        if df.empty:
+            print(f"  ⚠️  关键词 '{keyword}' 无数据")
+            continue
+        
+        yield keyword, df
+        
+        # 间隔时间，避免请求过快
+        time.sleep(random.uniform(2, 4))
+
+
+def write_sheet(writer, keyword, df):
+    """把一个关键词的结果写入 Excel 的独立 Sheet"""
+    sheet_name = keyword[:31]  # Sheet名限制31字符
+    with tracing.span('写入Excel', keyword=keyword):
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
+    print(f"  ✅ 关键词 '{keyword}' 写入完成（{len(df)} 条）\n")
+
+
+def save_sheet(path, keyword, df, new_file=False):
+    """只替换 Excel 中该关键词的 Sheet 并立即写入磁盘，其他 Sheet 保持不变
+
+    new_file=True 或文件不存在时新建文件（原有的 Sheet 全部丢弃）。
+    """
+    if Path(path).exists() and not new_file:
+        options = {'mode': 'a', 'if_sheet_exists': 'replace'}
+    else:
+        options = {'mode': 'w'}
+    with pd.ExcelWriter(path, engine='openpyxl', **options) as writer:
+        write_sheet(writer, keyword, df)
+
+
+def main(keywords=None, plans=None):
+    """爬取所有关键词，返回 {关键词: DataFrame}（同时保存到 xiaohongshu_data.xlsx）
+
+    plans 为 crawl_planner.plan_crawl 的结果时，按计划的顺序、笔记数和滚动次数爬取（空计划时不爬取）。
+    """
+    if plans is not None:
+        keywords = [plan.keyword for plan in plans]
+        plans = {plan.keyword: plan for plan in plans}
+    keywords = load_keywords() if keywords is None else keywords
+    results = {}
+    if not keywords:
+        print("⚠️  没有需要爬取的关键词")
+        return results
+    
     print("=" * 60)
     print("小红书笔记爬虫 (Selenium版)")
     print("=" * 60)
     
-    # 初始化浏览器
-    driver = init_driver()
+    # 初始化浏览器并登录（之后按页数/内存定期重启，崩溃后自动重启）
+    session = ManagedDriver()
+    session.start()
     
     try:
-        # 登录
-        login_xiaohongshu(driver)
-        
         # 开始爬取
-        with pd.ExcelWriter("xiaohongshu_data.xlsx", engine="openpyxl") as writer:
-            for keyword in KEYWORD_LIST:
-                df = crawl_keyword(driver, keyword, MAX_POSTS)
-                
-                if df.empty:
-                    print(f"  ⚠️  关键词 '{keyword}' 无数据")
-                    continue
-                
-                # 保存到Excel
-                sheet_name = keyword[:31]  # Sheet名限制31字符
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-                print(f"  ✅ 关键词 '{keyword}' 写入完成（{len(df)} 条）\n")
-                
-                # 间隔时间，避免请求过快
-                time.sleep(random.uniform(2, 4))
+        with pd.ExcelWriter(OUTPUT_FILE, engine="openpyxl") as writer:
+            for keyword, df in crawl_keywords(session, keywords, plans):
+                results[keyword] = df
+                write_sheet(writer, keyword, df)
         
         print("\n" + "=" * 60)
-        print("✅ 所有数据已保存到 xiaohongshu_data.xlsx")
+        print(f"✅ 所有数据已保存到 {OUTPUT_FILE}")
         print("=" * 60)
         
     except Exception as e:
         print(f"\n❌ 程序出错: {e}")
     finally:
         print("\n关闭浏览器...")
-        driver.quit()
+        session.quit()
+    
+    return results
 
 
 if __name__ == "__main__":
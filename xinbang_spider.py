@@ -7,40 +7,54 @@ from selenium.webdriver.support import expected_conditions as EC
 import time
 import pandas as pd
 
+import tracing
+
 CHROMEDRIVER_PATH = "path/to/chromedriver"  # 请替换为你的chromedriver路径
 
-options = Options()
-options.add_argument("--start-maximized")
-# options.add_argument("--headless") 
-options.add_argument("--disable-blink-features=AutomationControlled")
-options.add_argument("--incognito")
-options.add_argument("--disable-extensions")
+KEYWORDS = ["奶皮子糖葫芦"]
 
-service = Service(CHROMEDRIVER_PATH)
+TREND_FILE = "keyword_trend.csv"      # 关键词趋势（keyword, date, volume, hot_index）
+CONTENT_FILE = "content_meta.csv"     # 内容列表
 
-driver = webdriver.Chrome(
-    service=service,
-    options=options
-)
 
-driver.get("https://www.newrank.cn/")
+def init_driver():
+    """初始化Chrome浏览器"""
+    options = Options()
+    options.add_argument("--start-maximized")
+    # options.add_argument("--headless")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--incognito")
+    options.add_argument("--disable-extensions")
 
-# 登录验证
-print("👉 请手动登录新榜，登录完成后回到终端按 Enter")
-input()
+    service = Service(CHROMEDRIVER_PATH)
 
-try:
-    WebDriverWait(driver, 30).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, ".user-info"))  # 替换为登录成功后的标志性元素
+    return webdriver.Chrome(
+        service=service,
+        options=options
     )
-    print("✅ 登录成功")
-except:
-    print("❌ 登录失败，请重试")
-    driver.quit()
-    exit()
+
+
+def login_newrank(driver):
+    """打开新榜并等待手动登录，返回是否登录成功"""
+    driver.get("https://www.newrank.cn/")
+
+    # 登录验证
+    print("👉 请手动登录新榜，登录完成后回到终端按 Enter")
+    input()
+
+    try:
+        WebDriverWait(driver, 30).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ".user-info"))  # 替换为登录成功后的标志性元素
+        )
+        print("✅ 登录成功")
+        return True
+    except:
+        print("❌ 登录失败，请重试")
+        return False
 
 # 修改显式等待逻辑
-def fetch_keyword_trend(keyword):
+@tracing.traced('抓取趋势')
+def fetch_keyword_trend(driver, keyword):
     url = f"https://www.newrank.cn/xdnphb/keyword?word={keyword}"
     driver.get(url)
 
@@ -66,72 +80,97 @@ def fetch_keyword_trend(keyword):
 
     return records
 
-def fetch_content_list(keyword, max_pages=3):
+def fetch_content_list(driver, keyword, max_pages=3):
     url = f"https://www.newrank.cn/xdnphb/content?keyword={keyword}"
     driver.get(url)
 
     results = []
-    for _ in range(max_pages):
-        try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".content-item"))
-            )
-        except:
-            print(f"❌ 无法加载内容页面：{keyword}")
-            break
-
-        items = driver.find_elements(By.CSS_SELECTOR, ".content-item")
-        for it in items:
-            try:
-                title = it.find_element(By.CSS_SELECTOR, ".content-title").text
-                stats = it.find_elements(By.CSS_SELECTOR, ".content-stat span")
-
-                results.append({
-                    "keyword": keyword,
-                    "title": title,
-                    "like": stats[0].text if len(stats) > 0 else None,
-                    "comment": stats[1].text if len(stats) > 1 else None,
-                    "share": stats[2].text if len(stats) > 2 else None
-                })
-            except:
-                continue
-
-        # 翻页
+    for page in range(max_pages):
+        with tracing.span('抓取内容页', keyword=keyword, page=page + 1):
+            if not _fetch_content_page(driver, keyword, results):
+                break
+
+    return results
+
+
+def _fetch_content_page(driver, keyword, results):
+    """提取当前内容页并翻到下一页，不能继续时返回 False"""
+    try:
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".content-item"))
+        )
+    except:
+        print(f"❌ 无法加载内容页面：{keyword}")
+        return False
+
+    items = driver.find_elements(By.CSS_SELECTOR, ".content-item")
+    for it in items:
         try:
-            next_btn = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, ".next-page"))
-            )
-            next_btn.click()
-            time.sleep(3)
+            title = it.find_element(By.CSS_SELECTOR, ".content-title").text
+            stats = it.find_elements(By.CSS_SELECTOR, ".content-stat span")
+
+            results.append({
+                "keyword": keyword,
+                "title": title,
+                "like": stats[0].text if len(stats) > 0 else None,
+                "comment": stats[1].text if len(stats) > 1 else None,
+                "share": stats[2].text if len(stats) > 2 else None
+            })
         except:
-            print("❌ 无法翻页，可能已到最后一页")
-            break
+            continue
 
-    return results
+    # 翻页
+    try:
+        next_btn = WebDriverWait(driver, 10).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, ".next-page"))
+        )
+        next_btn.click()
+        time.sleep(3)
+    except:
+        print("❌ 无法翻页，可能已到最后一页")
+        return False
+    return True
+
+
+def main(keywords=None):
+    """抓取趋势和内容数据，返回 (趋势 DataFrame, 内容 DataFrame)，同时保存为CSV"""
+    driver = init_driver()
+
+    try:
+        if not login_newrank(driver):
+            return pd.DataFrame(), pd.DataFrame()
 
-keywords = ["奶皮子糖葫芦"]
+        trend_all = []
+        content_all = []
 
-trend_all = []
-content_all = []
+        for kw in keywords or KEYWORDS:
+            print(f"📈 抓取趋势数据：{kw}")
+            trend_all.extend(fetch_keyword_trend(driver, kw))
 
-for kw in keywords:
-    print(f"📈 抓取趋势数据：{kw}")
-    trend_all.extend(fetch_keyword_trend(kw))
+            print(f"🧾 抓取内容数据：{kw}")
+            content_all.extend(fetch_content_list(driver, kw))
 
-    print(f"🧾 抓取内容数据：{kw}")
-    content_all.extend(fetch_content_list(kw))
+        trend_df = pd.DataFrame(trend_all)
+        content_df = pd.DataFrame(content_all)
+
+        with tracing.span('写入CSV'):
+            trend_df.to_csv(
+                TREND_FILE,
+                index=False,
+                encoding="utf-8-sig"
+            )
+
+            content_df.to_csv(
+                CONTENT_FILE,
+                index=False,
+                encoding="utf-8-sig"
+            )
 
-pd.DataFrame(trend_all).to_csv(
-    "keyword_trend.csv",
-    index=False,
-    encoding="utf-8-sig"
-)
+        print("✅ 数据采集完成")
+        return trend_df, content_df
+    finally:
+        driver.quit()
 
-pd.DataFrame(content_all).to_csv(
-    "content_meta.csv",
-    index=False,
-    encoding="utf-8-sig"
-)
 
-print("✅ 数据采集完成")
-driver.quit()
+if __name__ == "__main__":
+    main()